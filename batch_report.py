@@ -0,0 +1,143 @@
+"""Write a PDF report (plot and statistics table) for every recording of a directory, without a display.
+
+Usage: python batch_report.py [inputs...] [--out-dir reports/batch] [--workers N]
+Inputs are CSV/.sig files or directories searched recursively (default: dataset/). Files are spread over a
+process pool; each one gets <name>.pdf in the output directory and a line per channel in index.csv.
+"""
+import os
+
+# Plots are rendered offscreen; set before Qt is imported here or in a worker process
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import argparse
+import csv
+import glob
+import io
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pyqtgraph as pg
+from pyqtgraph import exporters
+from reportlab.lib.utils import ImageReader
+
+from main import (MinMaxPyramid, RunningStats, SignalFile, png_bytes, read_csv_channels, stats_table,
+                  write_report)
+
+IMAGE_WIDTH = 1000
+IMAGE_HEIGHT = 400
+EXTENSIONS = ('.csv', '.sig')
+
+
+def init_worker():
+    pg.mkQApp()
+
+
+def find_recordings(inputs):
+    files = []
+    for path in inputs:
+        if os.path.isdir(path):
+            for extension in EXTENSIONS:
+                files += glob.glob(os.path.join(path, '**', '*' + extension), recursive=True)
+        else:
+            files.append(path)
+    return sorted(set(files))
+
+
+def render_plot(time, pyramids):
+    """Draw every channel, decimated to the image width, and return the plot as PNG bytes."""
+    plot = pg.PlotWidget()
+    plot.resize(IMAGE_WIDTH, IMAGE_HEIGHT)
+    plot.showGrid(x=True, y=True)
+    for channel, pyramid in enumerate(pyramids):
+        pen = 'b' if len(pyramids) == 1 else pg.intColor(channel, hues=max(len(pyramids), 9))
+        plot.plot(*pyramid.decimate(0, len(time), 2 * IMAGE_WIDTH), pen=pen)
+    exporter = exporters.ImageExporter(plot.plotItem)
+    exporter.parameters()['width'] = IMAGE_WIDTH
+    return png_bytes(exporter.export(toBytes=True))
+
+
+def report_file(file_name, report_filename):
+    """Write the report of one recording; returns one index row per channel."""
+    started = time.perf_counter()
+    try:
+        if file_name.endswith('.sig'):
+            signal_file = SignalFile(file_name)
+            signal_time, channels = signal_file.time, signal_file.channels.T
+            pyramids = [signal_file.pyramid(channel) for channel in range(channels.shape[1])]
+        else:
+            signal_time, channels = read_csv_channels(file_name)
+            pyramids = [MinMaxPyramid(signal_time, channels[:, channel]) for channel in range(channels.shape[1])]
+
+        named_stats = []
+        for channel in range(channels.shape[1]):
+            stats = RunningStats()
+            stats.extend(channels[:, channel])
+            named_stats.append((f"Channel {channel + 1}", stats))
+
+        snapshot = ImageReader(io.BytesIO(render_plot(signal_time, pyramids)))
+        write_report(report_filename, snapshot, stats_table(named_stats),
+                     title=f"Biological Signal Report: {os.path.basename(file_name)}")
+    except (OSError, ValueError) as e:
+        return [{'file': file_name, 'report': '', 'error': str(e)}]
+
+    elapsed = time.perf_counter() - started
+    rows = []
+    for channel_name, stats in named_stats:
+        row = {'file': file_name, 'report': report_filename, 'channel': channel_name, 'samples': stats.count,
+               'seconds': f"{elapsed:.3f}"}
+        row.update((name.lower(), f"{value:.5f}") for name, value in stats.summary())
+        rows.append(row)
+    return rows
+
+
+def report_name(file_name, out_dir, used):
+    name = os.path.splitext(os.path.basename(file_name))[0]
+    candidate, suffix = name, 1
+    # Same file name in different folders
+    while candidate in used:
+        suffix += 1
+        candidate = f"{name}_{suffix}"
+    used.add(candidate)
+    return os.path.join(out_dir, candidate + '.pdf')
+
+
+def main():
+    default_input = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dataset')
+    parser = argparse.ArgumentParser(description="Write PDF reports for many recordings without the GUI.")
+    parser.add_argument('inputs', nargs='*', default=[default_input], help="CSV/.sig files or directories")
+    parser.add_argument('--out-dir', default=os.path.join('reports', 'batch'), help="where reports and index.csv go")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="worker processes")
+    args = parser.parse_args()
+
+    files = find_recordings(args.inputs)
+    if not files:
+        parser.error("no CSV or .sig recordings found")
+    os.makedirs(args.out_dir, exist_ok=True)
+    used = set()
+    jobs = [(file_name, report_name(file_name, args.out_dir, used)) for file_name in files]
+
+    started = time.perf_counter()
+    rows = []
+    # Spawned workers start without the parent's Qt state
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=context, initializer=init_worker) as pool:
+        futures = [pool.submit(report_file, *job) for job in jobs]
+        for done, future in enumerate(as_completed(futures), 1):
+            file_rows = future.result()
+            rows += file_rows
+            status = file_rows[0].get('error') or file_rows[0]['report']
+            print(f"[{done}/{len(jobs)}] {file_rows[0]['file']}: {status}")
+
+    fields = ['file', 'channel', 'samples', 'mean', 'median', 'std_dev', 'min', 'max', 'seconds', 'report', 'error']
+    index_path = os.path.join(args.out_dir, 'index.csv')
+    with open(index_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(sorted(rows, key=lambda row: (row['file'], row.get('channel', ''))))
+    failed = sum(1 for row in rows if row.get('error'))
+    print(f"{len(jobs)} files in {time.perf_counter() - started:.1f} s, {failed} failed, index: {index_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,440 @@
+"""Offscreen benchmarks of the viewer's hot paths on synthetic signals, compared against a stored baseline.
+
+Usage: python benchmark.py [--sizes 3 4 5 6 7 8] [--out benchmark_results.json] [--baseline benchmark_baseline.json]
+                           [--save-baseline] [--tolerance 0.25] [--frames 120] [--budget 30]
+Sizes are powers of ten (10^3 to 10^8 samples by default). Every case runs in a fresh window with its timers
+stopped: file loading, playback frames (update_graphs / plot_signal and the repaint), the radar paintEvent,
+live graphs with growing histories, report export, R-peak detection and the biquad filters. The startup
+phases of a fresh viewer process are timed once, independently of the sizes. Results are written as JSON; when a baseline exists
+the frame times and memory are compared with it and the exit status is 1 if something got slower or bigger
+than the tolerance allows, or if a case reports an error (such as a filter whose output depends on the chunking).
+"""
+import os
+
+# Nothing is shown; set before Qt is imported
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import argparse
+import gc
+import json
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyqtgraph as pg
+from PyQt5.QtCore import QT_VERSION_STR
+
+import main as viewer
+from main import (BiquadCascade, GrowableSignal, RangeTracker, RPeakDetector, SignalFile, filter_sections,
+                  memory_footprint, write_signal_file)
+
+SAMPLE_RATE = 1000.0  # Hz of the synthetic signals
+GENERATE_CHUNK = 1 << 22  # Samples generated at once
+CSV_MAX_SAMPLES = 10 ** 6  # Larger CSV files take minutes just to write, only the .sig loader is timed above
+CIRCLE_MAX_SAMPLES = 10 ** 7  # The radar keeps screen coordinates of every sample (16 bytes each)
+LIVE_BATCH = 100  # Samples received per frame by the live benchmark
+LIVE_PREFILL_CHUNK = 1 << 20
+FILTER_STAGES = (('highpass', 0.5, 2), ('lowpass', 40.0, 4), ('notch', 50.0, 30.0))
+FILTER_CHECK_SAMPLES = 2000  # Filtered again one sample at a time, as the HTTP poller delivers them
+FILTER_CHECK_TOLERANCE = 1e-9
+# Parts of metric names and whether a larger value is worse
+METRIC_DIRECTIONS = (('_ms', True), ('_bytes', True), ('_per_s', False))
+
+
+def synthetic_signal(count, seed=0):
+    """ECG-like test signal: a 1.2 Hz pulse train over slow drift, mains hum and noise."""
+    rng = np.random.default_rng(seed)
+    signal_time = np.arange(count, dtype=np.float64) / SAMPLE_RATE
+    amplitude = np.empty(count, dtype=np.float32)
+    for start in range(0, count, GENERATE_CHUNK):
+        t = signal_time[start:start + GENERATE_CHUNK]
+        phase = (t * 1.2) % 1.0
+        amplitude[start:start + len(t)] = (np.exp(-((phase - 0.3) / 0.02) ** 2)
+                                           + 0.2 * np.sin(2 * np.pi * 0.3 * t)
+                                           + 0.05 * np.sin(2 * np.pi * 50 * t)
+                                           + 0.02 * rng.standard_normal(len(t)))
+    return signal_time, amplitude
+
+
+def rss_bytes():
+    """Current resident memory of the process (peak on systems without /proc)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def summarize(durations, prefix):
+    """Mean, median, 95th percentile and worst of a list of durations in seconds, as ms metrics."""
+    durations = np.asarray(durations) * 1000
+    return {f'{prefix}_ms_mean': float(durations.mean()), f'{prefix}_ms_p50': float(np.median(durations)),
+            f'{prefix}_ms_p95': float(np.percentile(durations, 95)), f'{prefix}_ms_max': float(durations.max())}
+
+
+def new_window():
+    """Main window with every timer stopped, so only the benchmarked calls do any work."""
+    window = viewer.MainWindow()
+    for timer in (window.timer, window.real_time_timer, window.circular_graph_timer, window.graph3.circular_timer):
+        timer.stop()
+    pg.mkQApp().processEvents()
+    return window
+
+
+def close_window(window):
+    window.close()
+    window.deleteLater()
+    pg.mkQApp().processEvents()
+    gc.collect()
+
+
+def bench_load(files, count, frames):
+    """load_signal_data on the CSV and .sig versions of the signal, and opening the .sig pyramid."""
+    window = new_window()
+    result = {}
+    if 'csv' in files:
+        started = time.perf_counter()
+        signal_time, channels = window.load_signal_data(files['csv'])
+        elapsed = time.perf_counter() - started
+        result.update(csv_load_ms=elapsed * 1000, csv_samples_per_s=count / elapsed,
+                      csv_mb_per_s=os.path.getsize(files['csv']) / elapsed / 1e6)
+        del signal_time, channels
+    started = time.perf_counter()
+    signal_time, channels = window.load_signal_data(files['sig'])
+    result['sig_load_ms'] = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    pyramid = SignalFile(files['sig']).pyramid(0)
+    pyramid.decimate(0, count, 2000)  # First full view of the file
+    elapsed = time.perf_counter() - started
+    result.update(sig_open_ms=elapsed * 1000, sig_open_samples_per_s=count / elapsed)
+    del signal_time, channels, pyramid
+    close_window(window)
+    return result
+
+
+def bench_frame(files, count, frames):
+    """Playback frames of Graph 1, halfway through the file: update_graphs, plot_signal and the repaint."""
+    window = new_window()
+    signal_file = SignalFile(files['sig'])
+    before = rss_bytes()
+    signal = window.add_channel('Graph 1', files['sig'], signal_file.time, signal_file.amplitude, path=files['sig'])
+    signal.pyramid = signal_file.pyramid(0)
+    signal.last_index = count // 2
+    signal.cursor = float(signal.last_index)
+    window.is_playing_graph['Graph 1'] = True
+    plot_widget = window.plot_widgets['Graph 1']
+
+    update_times, plot_times, paint_times = [], [], []
+    for _ in range(frames):
+        # One refresh interval of playback per frame
+        window.last_frame_time = time.perf_counter() - 1 / viewer.DEFAULT_REFRESH_RATE
+        started = time.perf_counter()
+        window.update_graphs()
+        update_times.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        window.plot_signal('Graph 1')
+        plot_times.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        plot_widget.viewport().repaint()
+        paint_times.append(time.perf_counter() - started)
+
+    result = {**summarize(update_times, 'update_graphs'), **summarize(plot_times, 'plot_signal'),
+              **summarize(paint_times, 'paint')}
+    resident, mapped = window.signal_store.memory_usage('Graph 1')
+    result.update(resident_bytes=resident, mapped_bytes=mapped, rss_delta_bytes=rss_bytes() - before,
+                  points_drawn=len(signal.buffer.curve.xData))
+    close_window(window)
+    return result
+
+
+def bench_circle(files, count, frames):
+    """Radar paintEvent: the first paint of new data, then one sweep step per frame."""
+    if count > CIRCLE_MAX_SAMPLES:
+        return {'skipped': f"more than {CIRCLE_MAX_SAMPLES} samples"}
+    window = new_window()
+    app = pg.mkQApp()
+    graph = window.graph3
+    before = rss_bytes()
+    graph.data = np.asarray(SignalFile(files['sig']).amplitude, dtype=np.float64)
+    graph.angle = np.pi / 90
+    started = time.perf_counter()
+    graph.repaint()
+    first_paint = time.perf_counter() - started
+
+    paint_times = []
+    for _ in range(frames):
+        started = time.perf_counter()
+        graph.update_circular_graph()
+        app.processEvents()  # Delivers the partial repaint
+        paint_times.append(time.perf_counter() - started)
+    result = {'first_paint_ms': first_paint * 1000, **summarize(paint_times, 'paint'),
+              'rss_delta_bytes': rss_bytes() - before}
+    graph.data = None
+    close_window(window)
+    return result
+
+
+def bench_live(files, count, frames):
+    """Live graph with a history of count samples receiving LIVE_BATCH new samples per frame."""
+    window = new_window()
+    before = rss_bytes()
+    signal = window.add_channel('Graph 2', 'live', np.empty(0), np.empty(0))
+    signal.store = GrowableSignal()
+    signal.tracker = RangeTracker()
+    window.live_channels['Graph 2'] = signal
+    # History received before the measured frames, in chunks like a long session
+    signal_file = SignalFile(files['sig'])
+    for start in range(0, count, LIVE_PREFILL_CHUNK):
+        times = np.asarray(signal_file.time[start:start + LIVE_PREFILL_CHUNK])
+        values = np.asarray(signal_file.amplitude[start:start + LIVE_PREFILL_CHUNK], dtype=np.float64)
+        signal.store.extend(times, values)
+        signal.tracker.extend(times, values)
+        signal.stats.extend(values)
+    signal.set_data(*signal.store.view())
+    signal.buffer.extend(signal.time[-signal.buffer.capacity:], signal.amplitude[-signal.buffer.capacity:])
+
+    drain_times, update_times = [], []
+    next_time = signal.time[-1] if count else 0.0
+    for frame in range(frames):
+        times = next_time + (np.arange(LIVE_BATCH) + 1) / SAMPLE_RATE
+        next_time = times[-1]
+        window.live_queue.put(('Graph 2', times, np.sin(times)))
+        started = time.perf_counter()
+        window.drain_live_samples()  # Ends with update_real_time_graphs
+        drain_times.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        window.update_real_time_graphs()
+        update_times.append(time.perf_counter() - started)
+
+    result = {**summarize(drain_times, 'drain_live_samples'), **summarize(update_times, 'update_real_time_graphs')}
+    resident, mapped = memory_footprint(signal.arrays())
+    result.update(resident_bytes=resident, rss_delta_bytes=rss_bytes() - before)
+    close_window(window)
+    return result
+
+
+def bench_export(files, count, frames):
+    """export_report on a fully played glued graph: the GUI-thread part and the time until the PDF exists."""
+    window = new_window()
+    app = pg.mkQApp()
+    signal_file = SignalFile(files['sig'])
+    signal = window.add_channel('Glued Signals', files['sig'], signal_file.time, signal_file.amplitude,
+                                path=files['sig'])
+    signal.pyramid = signal_file.pyramid(0)
+    signal.last_index = count
+    signal.stats.extend(signal_file.amplitude)
+    window.plot_signal('Glued Signals')
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as out_dir:
+        os.chdir(out_dir)  # Reports go to reports/ under the working directory
+        try:
+            started = time.perf_counter()
+            window.export_report()
+            gui = time.perf_counter() - started
+            while window.export_workers:
+                app.processEvents()
+                time.sleep(0.001)
+            total = time.perf_counter() - started
+            written = os.listdir('reports') if os.path.isdir('reports') else []
+        finally:
+            os.chdir(cwd)
+    close_window(window)
+    if not written:
+        return {'error': window.exportLabel.text() or "no report written"}
+    return {'export_gui_ms': gui * 1000, 'export_total_ms': total * 1000}
+
+
+def bench_rpeaks(files, count, frames):
+    """RPeakDetector over a whole recording in big chunks, then per frame on LIVE_BATCH new samples."""
+    signal_file = SignalFile(files['sig'])
+    detector = RPeakDetector(SAMPLE_RATE)
+    beats = 0
+    started = time.perf_counter()
+    for start in range(0, count, LIVE_PREFILL_CHUNK):
+        found, _ = detector.process(np.asarray(signal_file.time[start:start + LIVE_PREFILL_CHUNK]),
+                                    signal_file.amplitude[start:start + LIVE_PREFILL_CHUNK])
+        beats += len(found)
+    total = time.perf_counter() - started
+
+    frame_times = []
+    next_time = signal_file.time[-1]
+    for frame in range(frames):
+        times = next_time + (np.arange(LIVE_BATCH) + 1) / SAMPLE_RATE
+        next_time = times[-1]
+        started = time.perf_counter()
+        detector.process(times, (times * 1.2) % 1.0 < 0.05)
+        frame_times.append(time.perf_counter() - started)
+    # The synthetic pulse beats 1.2 times a second; a rate comes with every beat after the first
+    return {'rpeaks_total_ms': total * 1000, 'rpeaks_samples_per_s': count / total,
+            'rpeaks_found_ratio': beats / max(1.2 * count / SAMPLE_RATE - 1, 1),
+            **summarize(frame_times, 'rpeaks_frame')}
+
+
+def bench_filter(files, count, frames):
+    """BiquadCascade over a whole recording in big chunks, then per frame on LIVE_BATCH new samples.
+
+    The first samples are also filtered one at a time; any difference from the block output is an error.
+    """
+    signal_file = SignalFile(files['sig'])
+    sections = filter_sections(FILTER_STAGES, SAMPLE_RATE)
+    head = np.asarray(signal_file.amplitude[:FILTER_CHECK_SAMPLES])
+    whole = BiquadCascade(sections).process(head)
+    single = BiquadCascade(sections)
+    one_by_one = np.concatenate([single.process(head[index:index + 1]) for index in range(len(head))])
+    mismatch = float(np.max(np.abs(whole - one_by_one)))
+    if mismatch > FILTER_CHECK_TOLERANCE:
+        return {'error': f"filtering one sample at a time differs from the block output by {mismatch:.3g}"}
+
+    cascade = BiquadCascade(sections)
+    started = time.perf_counter()
+    for start in range(0, count, LIVE_PREFILL_CHUNK):
+        cascade.process(signal_file.amplitude[start:start + LIVE_PREFILL_CHUNK])
+    total = time.perf_counter() - started
+
+    frame_times = []
+    for frame in range(frames):
+        batch = signal_file.amplitude[frame * LIVE_BATCH % count:][:LIVE_BATCH]
+        started = time.perf_counter()
+        cascade.process(batch)
+        frame_times.append(time.perf_counter() - started)
+    return {'filter_total_ms': total * 1000, 'filter_samples_per_s': count / total,
+            **summarize(frame_times, 'filter_frame')}
+
+
+CASES = {
+    'load': bench_load,
+    'frame': bench_frame,
+    'circle': bench_circle,
+    'live': bench_live,
+    'export': bench_export,
+    'rpeaks': bench_rpeaks,
+    'filter': bench_filter,
+}
+
+
+def bench_startup(runs):
+    """Median time of each startup phase of a fresh viewer process, up to its first interactive frame."""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')
+    reports = []
+    with tempfile.TemporaryDirectory() as work_dir:  # Keeps the startup log out of the repository
+        for _ in range(runs):
+            output = subprocess.run([sys.executable, script, '--startup-report', '--quit-after-startup'],
+                                    cwd=work_dir, capture_output=True, text=True, timeout=60).stdout
+            reports.append(json.loads(output.strip().splitlines()[-1]))
+    result = {f'{phase}_ms': float(np.median([report['phases_ms'][phase] for report in reports]))
+              for phase in reports[0]['phases_ms']}
+    result['total_ms'] = float(np.median([report['total_ms'] for report in reports]))
+    return result
+
+
+def write_inputs(count, directory):
+    """Synthetic recording of count samples as .sig (and CSV when small enough)."""
+    signal_time, amplitude = synthetic_signal(count)
+    files = {'sig': os.path.join(directory, f'synthetic_{count}.sig')}
+    write_signal_file(files['sig'], signal_time, amplitude)
+    if count <= CSV_MAX_SAMPLES:
+        files['csv'] = os.path.join(directory, f'synthetic_{count}.csv')
+        pd.DataFrame({0: signal_time, 1: amplitude}).to_csv(files['csv'], header=False, index=False)
+    return files
+
+
+def compare(results, baseline, tolerance):
+    """Relative change of every shared metric; regressions are changes in the bad direction beyond tolerance."""
+    comparison, regressions = {}, []
+    for key, metrics in results.items():
+        for name, value in metrics.items():
+            old = baseline.get(key, {}).get(name)
+            larger_is_worse = next((worse for part, worse in METRIC_DIRECTIONS if part in name), None)
+            if larger_is_worse is None or not isinstance(old, (int, float)) or old <= 0:
+                continue
+            change = value / old - 1
+            comparison.setdefault(key, {})[name] = {'baseline': old, 'current': value, 'change': change}
+            # A single worst frame is too noisy to fail a run on
+            if (change if larger_is_worse else -change) > tolerance and not name.endswith('_max'):
+                regressions.append((key, name, old, value, change))
+    return comparison, regressions
+
+
+def environment():
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+            'pyqtgraph': pg.__version__, 'qt': QT_VERSION_STR, 'platform': platform.platform(),
+            'processor': platform.processor(), 'cpu_count': os.cpu_count()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the viewer's hot paths offscreen.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[3, 4, 5, 6, 7, 8],
+                        help="signal lengths as powers of ten")
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES))
+    parser.add_argument('--frames', type=int, default=120, help="frames timed per case")
+    parser.add_argument('--startup-runs', type=int, default=5, help="viewer launches timed (0 to skip)")
+    parser.add_argument('--budget', type=float, default=30.0,
+                        help="skip the larger sizes of a case once one run takes longer than this (s)")
+    parser.add_argument('--out', default='benchmark_results.json')
+    parser.add_argument('--baseline', default='benchmark_baseline.json')
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed relative slowdown or growth")
+    args = parser.parse_args()
+
+    pg.mkQApp()
+    results, over_budget = {}, set()
+    if args.startup_runs:
+        results['startup'] = bench_startup(args.startup_runs)
+        print(f"startup: {results['startup']['total_ms']:.0f} ms to the first frame", flush=True)
+    with tempfile.TemporaryDirectory() as data_dir:
+        for exponent in sorted(args.sizes):
+            count = 10 ** exponent
+            print(f"10^{exponent} samples: writing inputs...", flush=True)
+            files = write_inputs(count, data_dir)
+            for case in args.cases:
+                key = f'{case}/{count}'
+                if case in over_budget:
+                    results[key] = {'skipped': f"a smaller size took over {args.budget} s"}
+                    continue
+                started = time.perf_counter()
+                results[key] = CASES[case](files, count, args.frames)
+                elapsed = time.perf_counter() - started
+                if elapsed > args.budget:
+                    over_budget.add(case)
+                print(f"  {key}: {elapsed:.1f} s", flush=True)
+            for path in files.values():
+                os.remove(path)
+
+    report = {'created': datetime.now().isoformat(timespec='seconds'), 'environment': environment(),
+              'frames': args.frames, 'results': results}
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report['baseline'] = args.baseline
+        report['comparison'], regressions = compare(results, baseline['results'], args.tolerance)
+        if baseline.get('environment') != report['environment']:
+            print("Note: the baseline was recorded on a different machine or library versions")
+
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.out}")
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+
+    for key, name, old, value, change in regressions:
+        print(f"REGRESSION {key} {name}: {old:.4g} -> {value:.4g} ({change:+.0%})")
+    failures = [(key, metrics['error']) for key, metrics in results.items() if 'error' in metrics]
+    for key, error in failures:
+        print(f"FAILED {key}: {error}")
+    if regressions or failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""Convert CSV recordings (time column followed by amplitude columns) to memory-mappable .sig files.
+
+Usage: python convert_dataset.py [files...] [--dtype float32|float64] [--out-dir DIR]
+Without file arguments every dataset/*.csv file is converted next to its source.
+"""
+import argparse
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+from main import DEFAULT_BLOCK_SIZE, write_signal_file
+
+
+def convert(csv_path, out_dir=None, dtype=np.float32, block_size=DEFAULT_BLOCK_SIZE):
+    data = pd.read_csv(csv_path, header=None).to_numpy(dtype=np.float64)
+    data = data[np.isfinite(data[:, 0])]  # Blank rows (a trailing ',') have no time
+    base_name = os.path.splitext(os.path.basename(csv_path))[0] + '.sig'
+    sig_path = os.path.join(out_dir or os.path.dirname(csv_path), base_name)
+    write_signal_file(sig_path, data[:, 0], data[:, 1:], dtype=dtype, block_size=block_size)
+    return sig_path, data.shape
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert CSV signals to the binary .sig format.")
+    parser.add_argument('files', nargs='*', help="CSV files to convert (default: dataset/*.csv)")
+    parser.add_argument('--dtype', choices=['float32', 'float64'], default='float32',
+                        help="storage type of the amplitude columns")
+    parser.add_argument('--block-size', type=int, default=DEFAULT_BLOCK_SIZE,
+                        help="samples per block index entry")
+    parser.add_argument('--out-dir', help="write .sig files here instead of next to the CSV files")
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dataset', '*.csv')))
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+    for csv_path in files:
+        sig_path, shape = convert(csv_path, args.out_dir, np.dtype(args.dtype), args.block_size)
+        print(f"{csv_path} -> {sig_path} ({shape[0]} samples, {shape[1] - 1} channel(s))")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,38 +1,1730 @@
+import time
+# Startup phases are timed from here, see startup_report()
+STARTUP_MARKS = [('start', time.perf_counter())]
 import sys
+import io
+import csv
+import json
+import bisect
+import functools
+import struct
 import numpy as np
-import pandas as pd
-import time
 import os
-import requests
+import queue
+import socket
+from collections import deque
+import threading
+from urllib.parse import urlsplit, parse_qs
 from PyQt5.QtCore import pyqtSignal
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
-from reportlab.platypus import Table
-from PyQt5.QtGui import QBrush, QPen, QPainter, QImage
+from PyQt5.QtGui import QBrush, QPen, QPainter, QImage, QPixmap, QColor
 from PyQt5.QtWidgets import (QApplication, QWidget, QPushButton, QLabel, QRadioButton, QDialog,QDialogButtonBox,QGroupBox,QButtonGroup,
                              QVBoxLayout, QHBoxLayout, QSlider, QLineEdit,
-                             QScrollBar, QGridLayout, QComboBox, QFileDialog, QColorDialog, QMessageBox)
-from PyQt5.QtCore import Qt, QTimer, QRect
+                             QScrollBar, QGridLayout, QComboBox, QFileDialog, QColorDialog, QMessageBox,
+                             QProgressDialog, QSpinBox, QDoubleSpinBox, QCheckBox)
+from PyQt5.QtCore import Qt, QTimer, QRect, QRectF, QThread, QByteArray, QBuffer, QIODevice
 import pyqtgraph as pg
-from pyqtgraph import exporters
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.units import inch
-from reportlab.pdfgen import canvas
 from datetime import datetime
+# pandas, requests, reportlab and pyqtgraph.exporters are imported where they are first used (opening a
+# file, connecting a URL, exporting); loading them here more than doubled the time to the first frame
+STARTUP_MARKS.append(('imports', time.perf_counter()))
+
+# Number of most recent samples each plot keeps on screen during playback
+DEFAULT_BUFFER_CAPACITY = 8192
+# Playback clock defaults
+DEFAULT_REFRESH_RATE = 60  # Hz, used when the screen doesn't report one
+DEFAULT_SAMPLE_RATE = 50  # Samples per second when a file has no usable timestamps
+MAX_FRAME_STEP = 0.25  # Longest wall-clock step (s) a single frame may play
+SCRUB_STEPS = 1000  # Positions of a graph's horizontal scrubber over its duration
+SEEK_FILTER_SAMPLES = 1 << 18  # Samples filtered before a seek or preset change to bring a filter chain up to speed
+# Level-of-detail settings
+PYRAMID_BASE_FACTOR = 8  # Samples summarised by one block of the finest pyramid level
+PYRAMID_MIN_BLOCKS = 256  # Stop adding coarser levels below this many blocks
+PYRAMID_RAW_LIMIT = 1 << 22  # Largest raw range reduced on the fly when the finest level is too coarse
+# Binary signal file (.sig) layout
+SIGNAL_FILE_MAGIC = b'SIGVIEW1'
+SIGNAL_FILE_HEADER = struct.Struct('<8sHBBIQQQQ')  # magic, version, time/amplitude itemsize, channels, samples, block size, data/index offsets
+SIGNAL_FILE_VERSION = 1
+SIGNAL_FILE_ALIGNMENT = 64
+DEFAULT_BLOCK_SIZE = 4096
+# Background file loading
+LOADER_CHUNK_ROWS = 100000  # Rows parsed per chunk handed to the GUI
+GROWABLE_INITIAL_CAPACITY = 1 << 16
+CHANNEL_DTYPE = np.float32  # Storage type of multi-column recordings (the time column stays float64)
+MAX_DIALOG_ROWS = 16  # Channels listed per column of the channel dialog
+# Network acquisition
+DEFAULT_POLL_INTERVAL = 500  # ms between two requests to a real-time source
+REQUEST_TIMEOUT = 2.0  # Seconds before a request to the source is abandoned
+MAX_BACKOFF = 30.0  # Longest wait (s) between retries of a failing source
+LIVE_QUEUE_SIZE = 100000  # Sample batches waiting for the GUI before new ones are dropped
+# Socket ingest (tcp://host:port or udp://host:port, optional ?format=text|f32|f64&rate=Hz)
+SOCKET_RECEIVE_SIZE = 1 << 16
+SOCKET_POLL_TIMEOUT = 0.2  # Seconds a blocking socket call waits before checking for stop
+DEFAULT_SOCKET_RATE = 1000  # Samples per second assumed for value-only text lines
+LIVE_WINDOW_SECONDS = 10.0  # Trailing window used to autoscale live graphs
+# Capture logs of live sources (.cap): a header, then blocks of (receive time, count) and float64 times and values
+CAPTURE_MAGIC = b'SIGCAP01'
+CAPTURE_HEADER = struct.Struct('<8sHH')  # magic, version, length of the source URL that follows
+CAPTURE_VERSION = 1
+CAPTURE_BLOCK_HEADER = struct.Struct('<dI')  # wall-clock receive time, samples in the block
+CAPTURE_BUFFER_SIZE = 1 << 20
+CAPTURE_FLUSH_INTERVAL = 1.0  # Seconds between flushes, bounds what a crash can lose
+CAPTURE_DIR = 'captures'
+REPLAY_BATCH = 1 << 16  # Samples per queued batch when replaying at maximum speed
+# PDF reports
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'images')
+REPORT_MARGIN = 50
+EXPORT_NOTICE_MS = 6000  # How long the export notice stays in the window
+# Running statistics
+STATS_SKETCH_BINS = 1 << 14  # Histogram bins of the median sketch (error below one bin, range / bins)
+STATS_CHUNK = 1 << 20  # Samples summarised at once, bounds the temporary memory of big updates
+# Streaming filters: stages are (type, frequency in Hz, Butterworth order or notch Q)
+BIQUAD_BLOCK = 128  # Samples filtered by one matrix product
+NOTCH_Q = 30.0
+FILTER_CHUNK = 1 << 16  # Samples per call when the end of the played history is filtered again
+FILTER_PRESETS = {
+    'No filter': (),
+    'Baseline removal': (('highpass', 0.5, 2),),
+    'ECG, 50 Hz mains': (('highpass', 0.5, 2), ('notch', 50.0, NOTCH_Q)),
+    'ECG, 60 Hz mains': (('highpass', 0.5, 2), ('notch', 60.0, NOTCH_Q)),
+    'EMG band-pass': (('highpass', 20.0, 4), ('lowpass', 450.0, 4)),
+}
+# Spectrogram display: short-time FFT frames of SPECTROGRAM_WINDOW samples every SPECTROGRAM_HOP samples
+SPECTROGRAM_WINDOW = 256
+SPECTROGRAM_HOP = 64
+SPECTROGRAM_TILE = 64  # Columns per image item; only the tile being filled is uploaded again
+SPECTROGRAM_TILES = 32  # Tiles kept on screen, the oldest one is reused for new columns
+SPECTROGRAM_RANGE_DB = 60.0  # Dynamic range of the colour scale below the strongest frame seen
+# R-peak detection (band-passed, differentiated, squared and integrated ECG, as in Pan-Tompkins)
+QRS_BAND = (('highpass', 5.0, 2), ('lowpass', 15.0, 2))
+QRS_WINDOW = 0.15  # Seconds of the moving integration window
+QRS_REFRACTORY = 0.25  # No second beat this soon after one
+QRS_THRESHOLD = 0.3  # Fraction of the running peak level a QRS must cross
+QRS_LEARN = 2.0  # Seconds used to set the first peak level
+QRS_BLOCK = 1.0  # The threshold follows the peak level at least this often
+QRS_MAX_WIDTH = 0.5  # A region above the threshold this long is cut, bounding the look-back
+QRS_MAX_RR = 3.0  # Longer gaps (missed beats, lead off) give no heart rate and lower the threshold
+# Startup timing (python main.py --startup-report [--quit-after-startup])
+STARTUP_LOG = 'startup_times.jsonl'
+# Frame profiler
+PROFILE_BINS = tuple(np.logspace(-5, 0, 26))  # Duration histogram bin edges, 10 us to 1 s
+PROFILE_LATE_FACTOR = 1.5  # A timer tick is late when it comes this many intervals after the previous one
+PROFILE_TRACE_SIZE = 100000  # Most recent callback calls kept for export
+PROFILE_POLL_BACKLOG = 1000  # Poll round trips an HTTP worker keeps until the profiler takes them
+
+
+def mark_startup(phase):
+    """Record the end of a startup phase; later calls for the same phase are ignored."""
+    if all(name != phase for name, _ in STARTUP_MARKS):
+        STARTUP_MARKS.append((phase, time.perf_counter()))
+
+def startup_report():
+    """Milliseconds spent in each startup phase so far, and since the module started loading."""
+    phases = {name: 1000 * (mark - previous) for (_, previous), (name, mark) in zip(STARTUP_MARKS, STARTUP_MARKS[1:])}
+    return {'phases_ms': phases, 'total_ms': 1000 * (STARTUP_MARKS[-1][1] - STARTUP_MARKS[0][1])}
+
+def estimate_sample_rate(time):
+    """Samples per second from the median spacing of the timestamps (blank rows give NaN ones, skipped)."""
+    if len(time) < 2:
+        return DEFAULT_SAMPLE_RATE
+    steps = np.diff(time[:10000])
+    steps = steps[np.isfinite(steps)]
+    if not len(steps):
+        return DEFAULT_SAMPLE_RATE
+    step = np.median(steps)
+    if not np.isfinite(step) or step <= 0:
+        return DEFAULT_SAMPLE_RATE
+    return 1.0 / step
+
+
+def csv_shape(file_name, sample_size=1 << 20):
+    """(estimated rows, columns) of a CSV file, guessed from its first megabyte."""
+    with open(file_name, 'rb') as f:
+        sample = f.read(sample_size)
+    lines = max(sample.count(b'\n'), 1)
+    return int(os.path.getsize(file_name) * lines / max(len(sample), 1)), len(sample[:sample.find(b'\n')].split(b','))
+
+def csv_dtypes(column_count):
+    # Timestamps need double precision, the channels don't
+    return {column: (np.float64 if column == 0 else CHANNEL_DTYPE) for column in range(column_count)}
+
+def memory_footprint(arrays):
+    """(resident, mapped) bytes behind arrays, counting every underlying allocation once."""
+    resident = mapped = 0
+    seen = set()
+    for array in arrays:
+        if array is None:
+            continue
+        # Views are charged for the whole array they were cut from
+        while isinstance(array.base, np.ndarray):
+            array = array.base
+        if id(array) in seen:
+            continue
+        seen.add(id(array))
+        if isinstance(array, np.memmap):
+            mapped += array.nbytes  # Paged in from disk on demand
+        else:
+            resident += array.nbytes
+    return resident, mapped
+
+def format_bytes(size):
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
 
 class Signal:
-    def __init__(self, file_name, file_path, data, color, graph, show):
+    """One channel of a panel: metadata and playback state around columnar time/amplitude arrays.
+
+    The samples are never copied into the object, so moving a channel to another panel only moves references.
+    """
+    __slots__ = ('name', 'path', 'column', 'time', 'amplitude', 'color', 'graph', 'show', 'last_index', 'cursor',
+                 'sample_rate', 'pyramid', 'buffer', 'store', 'tracker', 'stats', 'chain', 'chain_column', 'filtered',
+                 'filtered_pyramid')
+
+    def __init__(self, file_name, file_path, time, amplitude, color, graph, show=True, column=None):
         self.name = file_name
         self.path = file_path
-        self.data = data
+        self.column = column  # Column of a multi-channel matrix this channel is a view of
+        self.time = time
+        self.amplitude = amplitude
         self.color = color
         self.graph = graph
         self.show = show
-        self.last_index = 0  # Initialize last index to 0
+        self.last_index = 0  # Number of samples played so far
+        self.cursor = 0.0  # Fractional playback position
+        self.sample_rate = estimate_sample_rate(time)
+        self.pyramid = None  # Level-of-detail summary of file-backed channels
+        self.buffer = SignalBuffer()  # Latest played samples and the channel's curve
+        self.store = None  # GrowableSignal while a loader or a live source fills the channel
+        self.tracker = None  # RangeTracker of live channels
+        self.stats = RunningStats()  # Of the samples played or received so far
+        self.chain = None  # BiquadCascade of the graph's filter preset, shared by the channels of one recording
+        self.chain_column = None  # This channel's column of that chain
+        self.filtered = None  # Filtered copy of the played samples of a file channel
+        self.filtered_pyramid = None
+
+    def __len__(self):
+        return len(self.amplitude)
+
+    def set_data(self, time, amplitude):
+        self.time = time
+        self.amplitude = amplitude
+
+    def arrays(self):
+        arrays = [self.time, self.amplitude, self.buffer.time, self.buffer.amplitude, self.stats.sketch.counts]
+        if self.pyramid is not None:
+            arrays += self.pyramid.mins + self.pyramid.maxs + [self.pyramid.base_times]
+        if self.filtered is not None:
+            arrays.append(self.filtered)
+        if self.filtered_pyramid is not None:
+            arrays += self.filtered_pyramid.mins + self.filtered_pyramid.maxs
+        return arrays
+
+    def memory_usage(self):
+        return memory_footprint(self.arrays())
 
     def __str__(self):
-        return (f"Name: {self.name}, Path: {self.path}, Data: {self.data}, Color: {self.color}, Graph: {self.graph}, "
-                f"Show: {self.show}")
+        resident, mapped = self.memory_usage()
+        return (f"Name: {self.name}, Path: {self.path}, Samples: {len(self)}, Color: {self.color}, Graph: {self.graph}, "
+                f"Show: {self.show}, Memory: {format_bytes(resident)} + {format_bytes(mapped)} mapped")
+
+class SignalStore:
+    """Channels shown on every panel; each channel belongs to exactly one panel at a time."""
+    def __init__(self, graph_names):
+        self.panels = {graph_name: [] for graph_name in graph_names}
+
+    def channels(self, graph_name):
+        return self.panels.get(graph_name, [])
+
+    def add(self, signal):
+        self.panels[signal.graph].append(signal)
+
+    def remove(self, signal):
+        self.panels[signal.graph].remove(signal)
+
+    def move(self, signal, destination):
+        """Reassign a channel to another panel without touching its samples."""
+        self.remove(signal)
+        signal.graph = destination
+        self.add(signal)
+
+    def memory_usage(self, graph_name=None):
+        """(resident, mapped) bytes of one panel or of every panel; shared columns count once."""
+        graph_names = self.panels if graph_name is None else [graph_name]
+        return memory_footprint(array for name in graph_names for signal in self.panels[name]
+                                for array in signal.arrays())
+
+class SignalBuffer:
+    """Preallocated ring buffer of the latest plotted samples, bound to one persistent curve."""
+    def __init__(self, capacity=DEFAULT_BUFFER_CAPACITY):
+        self.capacity = capacity
+        # Every sample is written twice (at i and i + capacity) so the latest
+        # samples are always one contiguous slice and never need unrolling
+        self.time = np.zeros(2 * capacity)
+        self.amplitude = np.zeros(2 * capacity)
+        self.head = 0  # Slot where the next sample goes
+        self.size = 0  # Number of valid samples
+        self.curve = None
+        self.pen = None
+
+    def attach(self, plot_widget, pen):
+        """Create the curve item once; later redraws only swap its data."""
+        self.pen = pen
+        self.curve = plot_widget.plot(pen=pen)
+        self.curve.setClipToView(True)
+
+    def reset(self):
+        self.head = 0
+        self.size = 0
+
+    def append(self, time, amplitude):
+        for offset in (self.head, self.head + self.capacity):
+            self.time[offset] = time
+            self.amplitude[offset] = amplitude
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def extend(self, times, amplitudes):
+        """Append a block of samples with slice copies only."""
+        count = len(times)
+        if count == 0:
+            return
+        if count > self.capacity:
+            # Older samples would be overwritten anyway
+            times = times[-self.capacity:]
+            amplitudes = amplitudes[-self.capacity:]
+            count = self.capacity
+        first = min(count, self.capacity - self.head)
+        rest = count - first
+        for base in (0, self.capacity):
+            self.time[base + self.head:base + self.head + first] = times[:first]
+            self.amplitude[base + self.head:base + self.head + first] = amplitudes[:first]
+            if rest:
+                self.time[base:base + rest] = times[first:]
+                self.amplitude[base:base + rest] = amplitudes[first:]
+        self.head = (self.head + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+
+    def copy_from(self, other):
+        """Take over another buffer's samples without reallocating."""
+        if other.capacity != self.capacity:
+            self.reset()
+            self.extend(*other.view())
+            return
+        np.copyto(self.time, other.time)
+        np.copyto(self.amplitude, other.amplitude)
+        self.head = other.head
+        self.size = other.size
+
+    def view(self):
+        """Return the buffered samples, oldest first, as views into the buffer."""
+        start = (self.head - self.size) % self.capacity
+        return self.time[start:start + self.size], self.amplitude[start:start + self.size]
+
+    def last_time(self):
+        if self.size == 0:
+            return None
+        return self.time[(self.head - 1) % self.capacity]
+
+    def set_pen(self, pen):
+        if pen != self.pen:
+            self.pen = pen
+            self.curve.setPen(pen)
+
+    def redraw(self):
+        self.curve.setData(*self.view())
+
+class MinMaxPyramid:
+    """Multi-resolution min/max summary of a signal, used to draw any zoom level with a bounded number of points."""
+    def __init__(self, time, amplitude, base_factor=PYRAMID_BASE_FACTOR, base_mins=None, base_maxs=None,
+                 base_times=None, valid_samples=None):
+        self.time = time
+        self.amplitude = amplitude
+        self.base_times = base_times  # Optional first timestamp of every finest-level block
+        self.factors = []
+        self.mins = []
+        self.maxs = []
+        self.counts = []  # Number of complete blocks computed on each level
+
+        # Level k summarises base_factor * 2**k samples per block
+        factor = base_factor
+        while len(amplitude) // factor >= PYRAMID_MIN_BLOCKS or not self.factors:
+            blocks = len(amplitude) // factor
+            self.factors.append(factor)
+            self.mins.append(np.empty(blocks, dtype=amplitude.dtype))
+            self.maxs.append(np.empty(blocks, dtype=amplitude.dtype))
+            self.counts.append(0)
+            factor *= 2
+        if base_mins is not None:
+            # Finest level comes precomputed (e.g. from a .sig block index), only coarser levels are built
+            self.counts[0] = len(self.mins[0])
+            self.mins[0][:] = base_mins[:self.counts[0]]
+            self.maxs[0][:] = base_maxs[:self.counts[0]]
+        # Arrays that are still being filled only summarise their valid prefix
+        self.update(len(amplitude) if valid_samples is None else valid_samples)
+
+    def truncate(self, valid_samples):
+        """Forget the blocks past valid_samples, so they are summarised again when those samples are rewritten."""
+        blocks = valid_samples // self.factors[0]
+        for level in range(len(self.factors)):
+            self.counts[level] = min(self.counts[level], blocks)
+            blocks //= 2
+
+    def skip(self, stop):
+        """Mark the blocks up to sample stop as empty (NaN) without reading them, e.g. after a seek."""
+        blocks = stop // self.factors[0]
+        for level in range(len(self.factors)):
+            if blocks > self.counts[level]:
+                self.mins[level][self.counts[level]:blocks] = np.nan
+                self.maxs[level][self.counts[level]:blocks] = np.nan
+                self.counts[level] = blocks
+            blocks //= 2
+
+    def update(self, valid_samples):
+        """Summarise any newly completed blocks among the first valid_samples samples."""
+        base = self.factors[0]
+        start, end = self.counts[0], valid_samples // base
+        if end > start:
+            block = self.amplitude[start * base:end * base].reshape(-1, base)
+            self.mins[0][start:end] = block.min(axis=1)
+            self.maxs[0][start:end] = block.max(axis=1)
+            self.counts[0] = end
+        for level in range(1, len(self.factors)):
+            start, end = self.counts[level], self.counts[level - 1] // 2
+            if end <= start:
+                break
+            # Each block merges two blocks of the finer level
+            self.mins[level][start:end] = self.mins[level - 1][2 * start:2 * end].reshape(-1, 2).min(axis=1)
+            self.maxs[level][start:end] = self.maxs[level - 1][2 * start:2 * end].reshape(-1, 2).max(axis=1)
+            self.counts[level] = end
+
+    def decimate(self, start, stop, max_points):
+        """Return at most about max_points (time, amplitude) points covering samples start..stop."""
+        count = stop - start
+        if count <= max_points or count <= self.factors[0]:
+            return self.time[start:stop], self.amplitude[start:stop]
+
+        # Coarsest detail that still gives one min/max pair per output column
+        level = 0
+        while level + 1 < len(self.factors) and 2 * count / self.factors[level] > max_points:
+            level += 1
+        factor = self.factors[level]
+        if level == 0 and 4 * count / factor < max_points and count <= PYRAMID_RAW_LIMIT:
+            # Precomputed blocks are too coarse for this zoom level, reduce the raw samples instead
+            return self.decimate_raw(start, stop, max_points)
+        first = start // factor
+        last = min(-(-stop // factor), self.counts[level])
+        if last <= first:
+            return self.decimate_raw(start, stop, max_points)
+
+        if self.base_times is not None:
+            ratio = factor // self.factors[0]
+            block_times = self.base_times[first * ratio:last * ratio:ratio]
+        else:
+            block_times = self.time[first * factor:last * factor:factor]
+        x = np.repeat(block_times, 2)
+        y = np.column_stack((self.mins[level][first:last], self.maxs[level][first:last])).ravel()
+        if last * factor < stop:
+            # Samples past the last complete block come from finer levels, at the same density
+            tail_points = max(2, max_points * (stop - last * factor) // count)
+            tail_x, tail_y = self.decimate(last * factor, stop, tail_points)
+            x = np.concatenate((x, tail_x))
+            y = np.concatenate((y, tail_y))
+        return x, y
+
+    def decimate_raw(self, start, stop, max_points):
+        """Min/max of the raw samples for ranges not summarised yet (at most a couple of blocks)."""
+        columns = max(1, max_points // 2)
+        step = -(-(stop - start) // columns)
+        if step <= 1:
+            return self.time[start:stop], self.amplitude[start:stop]
+        edges = np.arange(start, stop, step)
+        x = np.repeat(self.time[edges], 2)
+        y = np.column_stack((np.minimum.reduceat(self.amplitude[start:stop], edges - start),
+                             np.maximum.reduceat(self.amplitude[start:stop], edges - start))).ravel()
+        return x, y
+
+class GrowableSignal:
+    """Time/amplitude arrays filled chunk by chunk; capacity doubles when full so appends stay amortized O(1).
+
+    With channels set, amplitude is one (n_samples, n_channels) matrix sharing the time column.
+    """
+    def __init__(self, capacity=GROWABLE_INITIAL_CAPACITY, channels=None, dtype=np.float64):
+        self.time = np.empty(capacity)
+        # Column-major, so every channel is a contiguous column
+        self.amplitude = np.empty((capacity,) if channels is None else (capacity, channels), dtype=dtype, order='F')
+        self.size = 0
+
+    def extend(self, times, amplitudes):
+        """Append a chunk; returns True when the arrays had to be reallocated."""
+        count = len(amplitudes)
+        reallocated = self.size + count > len(self.amplitude)
+        if reallocated:
+            capacity = max(2 * len(self.amplitude), self.size + count)
+            for name in ('time', 'amplitude'):
+                current = getattr(self, name)
+                grown = np.empty((capacity,) + current.shape[1:], dtype=current.dtype, order='F')
+                grown[:self.size] = current[:self.size]
+                setattr(self, name, grown)
+        if times is not None:
+            self.time[self.size:self.size + count] = times
+        else:
+            self.time[self.size:self.size + count] = np.arange(self.size, self.size + count)
+        self.amplitude[self.size:self.size + count] = amplitudes
+        self.size += count
+        return reallocated
+
+    def view(self, column=None):
+        if column is None:
+            return self.time[:self.size], self.amplitude[:self.size]
+        return self.time[:self.size], self.amplitude[:self.size, column]
+
+class RangeTracker:
+    """Streaming min/max of a signal over its whole history and over a trailing time window.
+
+    The window uses monotonic deques, so each sample is pushed and popped at most once (amortized O(1)).
+    """
+    def __init__(self, window=LIVE_WINDOW_SECONDS):
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        self.history_min = np.inf
+        self.history_max = -np.inf
+        self.window_mins = deque()  # (time, value), values strictly increasing
+        self.window_maxs = deque()  # (time, value), values strictly decreasing
+
+    def extend(self, times, values):
+        if len(values) == 0:
+            return
+        self.history_min = min(self.history_min, values.min())
+        self.history_max = max(self.history_max, values.max())
+        self.push(self.window_mins, times, values, np.minimum, lambda back, first: back >= first)
+        self.push(self.window_maxs, times, values, np.maximum, lambda back, first: back <= first)
+        # Drop samples that left the window
+        oldest = times[-1] - self.window
+        for candidates in (self.window_mins, self.window_maxs):
+            while candidates[0][0] < oldest:
+                candidates.popleft()
+
+    @staticmethod
+    def push(candidates, times, values, extreme, dominated):
+        # Only samples that beat every later sample of the batch can ever become the window extreme
+        suffix = extreme.accumulate(values[::-1])[::-1]
+        keep = np.append(suffix[:-1] != suffix[1:], True)
+        kept_values = values[keep]
+        while candidates and dominated(candidates[-1][1], kept_values[0]):
+            candidates.pop()
+        candidates.extend(zip(times[keep].tolist(), kept_values.tolist()))
+
+    def history_range(self):
+        return self.history_min, self.history_max
+
+    def window_range(self):
+        return self.window_mins[0][1], self.window_maxs[0][1]
+
+class QuantileSketch:
+    """Fixed-size histogram of a stream whose range doubles to take in new extremes.
+
+    Quantiles are exact to within one bin width; merging two sketches costs O(bins).
+    """
+    def __init__(self, bins=STATS_SKETCH_BINS):
+        self.bins = bins
+        self.counts = np.zeros(bins)
+        self.low = None
+        self.width = None
+        self.total = 0.0
+
+    def add(self, values, weights=None):
+        if len(values) == 0:
+            return
+        low, high = values.min(), values.max()
+        if self.low is None:
+            self.low = low
+            self.width = max((high - low) / self.bins, abs(low) * 1e-9, 1e-12)
+        while low < self.low or high >= self.low + self.bins * self.width:
+            # Merge bins pairwise and double the width until the new values fit
+            merged = self.counts.reshape(-1, 2).sum(axis=1)
+            self.counts[:] = 0
+            if low < self.low:
+                self.counts[self.bins // 2:] = merged  # Grow downwards
+                self.low -= self.bins * self.width
+            else:
+                self.counts[:self.bins // 2] = merged
+            self.width *= 2
+        index = np.minimum(((values - self.low) / self.width).astype(np.int64), self.bins - 1)
+        if len(index) < self.bins // 8:
+            np.add.at(self.counts, index, 1 if weights is None else weights)
+        else:
+            self.counts += np.bincount(index, weights=weights, minlength=self.bins)
+        self.total += len(values) if weights is None else weights.sum()
+
+    def merge(self, other):
+        if other.total:
+            filled = np.flatnonzero(other.counts)
+            self.add(other.low + (filled + 0.5) * other.width, other.counts[filled])
+
+    def quantile(self, q):
+        if not self.total:
+            return np.nan
+        cumulative = np.cumsum(self.counts)
+        target = q * self.total
+        index = min(int(np.searchsorted(cumulative, target)), self.bins - 1)
+        before = cumulative[index - 1] if index else 0.0
+        fraction = (target - before) / self.counts[index] if self.counts[index] else 0.5
+        return self.low + (index + fraction) * self.width
+
+class RunningStats:
+    """Mean, standard deviation, extremes and median of a stream, updated chunk by chunk."""
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # Sum of squared differences from the mean (Welford)
+        self.min = np.inf
+        self.max = -np.inf
+        self.sketch = QuantileSketch()
+
+    def extend(self, values):
+        for start in range(0, len(values), STATS_CHUNK):
+            chunk = np.asarray(values[start:start + STATS_CHUNK], dtype=np.float64)
+            chunk = chunk[np.isfinite(chunk)]
+            if len(chunk):
+                chunk_mean = chunk.mean()
+                self.combine(len(chunk), chunk_mean, np.square(chunk - chunk_mean).sum())
+                self.min = min(self.min, chunk.min())
+                self.max = max(self.max, chunk.max())
+                self.sketch.add(chunk)
+
+    def combine(self, count, mean, m2):
+        # Chan et al. update: merges a whole chunk into the running Welford state
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def merge(self, other):
+        if other.count:
+            self.combine(other.count, other.mean, other.m2)
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self.sketch.merge(other.sketch)
+
+    def std(self):
+        return np.sqrt(self.m2 / self.count) if self.count else np.nan
+
+    def median(self):
+        return min(max(self.sketch.quantile(0.5), self.min), self.max) if self.count else np.nan
+
+    def summary(self):
+        """(name, value) rows, as shown in the report."""
+        return [('Mean', self.mean), ('Median', self.median()), ('Std_dev', self.std()),
+                ('Min', self.min), ('Max', self.max)]
+
+def biquad_section(kind, frequency, sample_rate, q):
+    """(b0, b1, b2, a1, a2) of a second-order low-pass, high-pass or notch section (a0 normalised to 1)."""
+    w0 = 2 * np.pi * frequency / sample_rate
+    cos_w0, alpha = np.cos(w0), np.sin(w0) / (2 * q)
+    if kind == 'lowpass':
+        b = ((1 - cos_w0) / 2, 1 - cos_w0, (1 - cos_w0) / 2)
+    elif kind == 'highpass':
+        b = ((1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2)
+    elif kind == 'notch':
+        b = (1.0, -2 * cos_w0, 1.0)
+    else:
+        raise ValueError(f"unknown filter type {kind}")
+    a0 = 1 + alpha
+    return (b[0] / a0, b[1] / a0, b[2] / a0, -2 * cos_w0 / a0, (1 - alpha) / a0)
+
+def filter_sections(stages, sample_rate):
+    """Biquad sections of a list of (type, frequency, order or notch Q) stages at a sampling rate.
+
+    Low- and high-pass stages are Butterworth filters of even order; stages at or above the Nyquist frequency
+    of the channel are left out.
+    """
+    sections = []
+    for kind, frequency, parameter in stages:
+        if not 0 < frequency < 0.49 * sample_rate:
+            continue
+        if kind == 'notch':
+            sections.append(biquad_section(kind, frequency, sample_rate, parameter))
+            continue
+        # A Butterworth filter of order n is n/2 sections with these quality factors
+        for k in range(parameter // 2):
+            q = 1 / (2 * np.cos((2 * k + 1) * np.pi / (2 * parameter)))
+            sections.append(biquad_section(kind, frequency, sample_rate, q))
+    return sections
+
+def finite_start(values, start, stop):
+    """Start of the run of finite samples ending at stop; filtered history skipped by a seek is NaN."""
+    gaps = np.flatnonzero(~np.isfinite(values[start:stop]))
+    return start + int(gaps[-1]) + 1 if len(gaps) else start
+
+class BiquadCascade:
+    """Cascaded second-order IIR sections filtering a stream block by block, keeping their state in between.
+
+    The recursion of a section is evaluated a block of samples at a time: its FIR part is a shifted sum of
+    the block, and its poles are one product with the lower-triangular impulse-response matrix, plus the
+    response to the last two outputs of the previous block. Those two outputs follow a linear recurrence
+    from block to block, solved for all blocks at once by a doubling scan. Exact, and vectorized over samples
+    and channels: the channels of one recording are filtered together, each with its own column of state.
+    """
+    def __init__(self, sections, channels=1, block_size=BIQUAD_BLOCK):
+        self.sections = [tuple(section) for section in sections]
+        self.channels = channels
+        self.block_size = block_size
+        self.responses = []  # (impulse response matrix, response to y[-1], response to y[-2]) per section
+        for b0, b1, b2, a1, a2 in self.sections:
+            impulse, from_y1, from_y2 = np.zeros(block_size), np.zeros(block_size), np.zeros(block_size)
+            previous = {'impulse': (0.0, 0.0), 'y1': (1.0, 0.0), 'y2': (0.0, 1.0)}  # (y[n-1], y[n-2])
+            for n in range(block_size):
+                for name, response in (('impulse', impulse), ('y1', from_y1), ('y2', from_y2)):
+                    y1, y2 = previous[name]
+                    response[n] = (1.0 if name == 'impulse' and n == 0 else 0.0) - a1 * y1 - a2 * y2
+                    previous[name] = (response[n], y1)
+            lag = np.subtract.outer(np.arange(block_size), np.arange(block_size))
+            self.responses.append((np.where(lag >= 0, impulse[np.maximum(lag, 0)], 0.0),
+                                   from_y1[:, None], from_y2[:, None]))
+        # x[n-1], x[n-2], y[n-1], y[n-2] of every section and channel at the end of the last block
+        self.state = np.zeros((len(self.sections), 4, channels))
+        self.settled = np.zeros(channels, dtype=bool)
+
+    def __len__(self):
+        return len(self.sections)
+
+    def reset(self, columns=None):
+        """Forget the history of some channels (all by default); their next samples start a new stream."""
+        self.settled[slice(None) if columns is None else columns] = False
+
+    def settle(self, columns, first):
+        """State of a filter that has seen the first samples forever, so a stream doesn't start with a jump."""
+        level = first.astype(np.float64)
+        for index, (b0, b1, b2, a1, a2) in enumerate(self.sections):
+            output = level * (b0 + b1 + b2) / (1 + a1 + a2)  # DC gain
+            self.state[index][:, columns] = (level, level, output, output)
+            level = output
+        self.settled[columns] = True
+
+    def process(self, values, columns=None):
+        """Filter the next samples of some channels, (n,) or (n, len(columns)); returns float64 of that shape."""
+        one_dimensional = values.ndim == 1
+        x = np.asarray(values, dtype=np.float64).reshape(len(values), -1)
+        if not self.sections or not len(x):
+            return x.ravel() if one_dimensional else x
+        columns = np.arange(self.channels) if columns is None else np.asarray(columns)
+        fresh = ~self.settled[columns]
+        if fresh.any():
+            self.settle(columns[fresh], x[0, fresh])
+        state = self.state[:, :, columns]
+        for index in range(len(self.sections)):
+            x = self.run_section(index, x, state[index])
+        self.state[:, :, columns] = state
+        return x.ravel() if one_dimensional else x
+
+    def run_section(self, index, x, state):
+        """Output of one section for input x of shape (n, channels), updating its (4, channels) state."""
+        b0, b1, b2, _, _ = self.sections[index]
+        impulse, from_y1, from_y2 = self.responses[index]
+        size, channels = x.shape
+        length = self.block_size
+        blocks = -(-size // length)
+        x1, x2, y1, y2 = state
+        extended = np.concatenate((x2[None], x1[None], x))
+        fir = np.zeros((blocks * length, channels))  # Zero padded to whole blocks, which doesn't change x's outputs
+        fir[:size] = b0 * extended[2:] + b1 * extended[1:-1] + b2 * extended[:-2]
+        # Response of every block on its own, from a zero state, in one product
+        columns = fir.reshape(blocks, length, channels).transpose(1, 0, 2).reshape(length, blocks * channels)
+        output = (impulse @ columns).reshape(length, blocks, channels).transpose(1, 0, 2)
+        # Last two outputs of every block: ends[b] = own[b] + step @ ends[b - 1]
+        step = np.array([[from_y1[-1, 0], from_y2[-1, 0]], [from_y1[-2, 0], from_y2[-2, 0]]])
+        ends = output[:, [-1, -2], :]
+        ends[0] += step @ np.stack((y1, y2))
+        power, offset = step, 1
+        while offset < blocks:
+            ends[offset:] = ends[offset:] + power @ ends[:-offset]
+            power, offset = power @ power, 2 * offset
+        carries = np.concatenate((np.stack((y1, y2))[None], ends[:-1]))
+        output += from_y1[None] * carries[:, :1] + from_y2[None] * carries[:, 1:]
+        output = output.reshape(blocks * length, channels)[:size]
+        # x1, x2, y1 and y2 are views of state: take the last y[n-1] before it is overwritten
+        previous = output[-2] if size > 1 else y1.copy()
+        state[:] = (extended[-1], extended[-2], output[-1], previous)
+        return output
+
+class StftFrames:
+    """Short-time Fourier transform of a stream: a frame is computed once, when its last sample arrives.
+
+    Samples that don't complete a frame yet are carried over to the next call. The window and the frame
+    buffer are allocated once, and every transform has the same length so numpy's cached FFT plan is reused.
+    """
+    def __init__(self, window_size=SPECTROGRAM_WINDOW, hop=SPECTROGRAM_HOP):
+        self.window_size = window_size
+        self.hop = hop
+        self.window = np.hanning(window_size)
+        self.scale = 2.0 / np.sum(self.window) ** 2  # A sine shows its mean power (0.5 for unit amplitude)
+        self.frames = np.empty((0, window_size))
+        self.reset()
+
+    @property
+    def bins(self):
+        return self.window_size // 2 + 1
+
+    def reset(self):
+        self.carry_times = np.empty(0)
+        self.carry_values = np.empty(0)
+
+    def extend(self, times, values):
+        """Frames completed by these samples: (centre times, power in dB of shape (frames, bins))."""
+        times = np.concatenate((self.carry_times, times))
+        values = np.concatenate((self.carry_values, values))
+        count = (len(values) - self.window_size) // self.hop + 1 if len(values) >= self.window_size else 0
+        # Next frame starts count hops in
+        self.carry_times, self.carry_values = times[count * self.hop:], values[count * self.hop:]
+        if not count:
+            return np.empty(0), np.empty((0, self.bins), dtype=np.float32)
+        if len(self.frames) < count:
+            self.frames = np.empty((max(count, 2 * len(self.frames)), self.window_size))
+        frames = self.frames[:count]
+        windows = np.lib.stride_tricks.sliding_window_view(values, self.window_size)[::self.hop][:count]
+        np.multiply(windows, self.window, out=frames)
+        power = np.abs(np.fft.rfft(frames, axis=1)) ** 2 * self.scale
+        centres = times[self.window_size // 2::self.hop][:count]
+        return centres, (10 * np.log10(power + 1e-20)).astype(np.float32)
+
+class Spectrogram:
+    """Spectrogram of one channel drawn in a plot as a row of image tiles, time on x and frequency on y.
+
+    New columns go into the last tile only, so each update uploads at most SPECTROGRAM_TILE columns, and
+    past frames are never computed again.
+    """
+    def __init__(self, plot_widget, signal):
+        self.plot_widget = plot_widget
+        self.signal = signal
+        self.stft = StftFrames()
+        self.lookup_table = pg.colormap.get('viridis').getLookupTable(nPts=256)
+        self.tiles = deque()  # [image item, column array, columns used, first column time]
+        self.sample_rate = None
+        self.peak = None  # Strongest bin seen, top of the colour scale
+
+    def reset(self):
+        self.stft.reset()
+        for item, _, _, _ in self.tiles:
+            self.plot_widget.removeItem(item)
+        self.tiles.clear()
+        self.peak = None
+
+    def levels(self):
+        return (self.peak - SPECTROGRAM_RANGE_DB, self.peak)
+
+    def new_tile(self, first_time):
+        if len(self.tiles) < SPECTROGRAM_TILES:
+            item = pg.ImageItem(axisOrder='col-major')
+            item.setLookupTable(self.lookup_table)
+            self.plot_widget.addItem(item)
+            columns = np.empty((SPECTROGRAM_TILE, self.stft.bins), dtype=np.float32)
+        else:
+            item, columns, _, _ = self.tiles.popleft()  # Recycle the oldest tile
+        tile = [item, columns, 0, first_time]
+        self.tiles.append(tile)
+        return tile
+
+    def extend(self, times, values):
+        """Add the frames completed by newly played or received samples and redraw the tiles they went to."""
+        centres, columns = self.stft.extend(times, values)
+        if not len(columns):
+            return
+        if self.sample_rate is None:
+            # From the channel, not this batch: live sources and slow playback bring one sample at a time
+            signal = self.signal
+            live = signal.tracker is not None
+            self.sample_rate = estimate_sample_rate(signal.time[-1000:]) if live else signal.sample_rate
+        peak = float(columns.max())
+        rescale = self.peak is None or peak > self.peak + 3.0
+        if rescale:
+            self.peak = peak if self.peak is None else max(peak, self.peak)
+        changed = []
+        written = 0
+        while written < len(columns):
+            if not self.tiles or self.tiles[-1][2] == SPECTROGRAM_TILE:
+                self.new_tile(centres[written])
+            tile = self.tiles[-1]
+            count = min(SPECTROGRAM_TILE - tile[2], len(columns) - written)
+            tile[1][tile[2]:tile[2] + count] = columns[written:written + count]
+            tile[2] += count
+            written += count
+            if not changed or changed[-1] is not tile:
+                changed.append(tile)
+        if rescale:
+            for item, _, _, _ in self.tiles:
+                item.setLevels(self.levels())
+        step = self.stft.hop / self.sample_rate
+        for item, tile_columns, used, first_time in changed:
+            item.setImage(tile_columns[:used], autoLevels=False, levels=self.levels())
+            # Pixel centres on the frame centres, full height up to the Nyquist frequency
+            item.setRect(QRectF(first_time - step / 2, 0, used * step, self.sample_rate / 2))
+
+class RPeakDetector:
+    """Streaming R-peak detector turning ECG samples into an instantaneous heart rate, beat by beat.
+
+    The ECG is band-passed, differentiated, squared and integrated over QRS_WINDOW, all vectorized over
+    whatever block arrives. Regions of the envelope above a fraction of the running peak level are QRS
+    complexes; their maximum is the beat. Only an open region and the integration window are carried from
+    one call to the next, so memory doesn't grow with the recording.
+    """
+    def __init__(self, sample_rate):
+        self.sample_rate = sample_rate
+        self.band = BiquadCascade(filter_sections(QRS_BAND, sample_rate))
+        self.window = max(int(QRS_WINDOW * sample_rate), 1)
+        self.last_value = None
+        self.energy_tail = np.zeros(self.window - 1)  # Last squared slopes, for the running sum
+        self.pending_envelope = np.empty(0)  # Not yet resolved: learning phase or an open region
+        self.pending_times = np.empty(0)
+        self.level = None
+        self.last_beat = None
+        self.quiet_since = None  # Time from which a missing beat lowers the threshold
+
+    def envelope(self, values):
+        filtered = self.band.process(np.asarray(values, dtype=np.float64))
+        slope = np.diff(filtered, prepend=filtered[0] if self.last_value is None else self.last_value)
+        self.last_value = filtered[-1]
+        energy = np.concatenate((self.energy_tail, slope * slope))
+        self.energy_tail = energy[len(energy) - self.window + 1:]
+        sums = np.concatenate(([0.0], np.cumsum(energy)))
+        return (sums[self.window:] - sums[:-self.window]) / self.window
+
+    def process(self, times, values):
+        """Beats found in the next samples: (beat times, heart rate in bpm of each beat from the previous)."""
+        if not len(values):
+            return np.empty(0), np.empty(0)
+        envelope = np.concatenate((self.pending_envelope, self.envelope(values)))
+        times = np.concatenate((self.pending_times, times))
+        resolved = 0
+        if self.level is None:
+            learn = int(QRS_LEARN * self.sample_rate)
+            if len(envelope) < learn:
+                self.pending_envelope, self.pending_times = envelope, times
+                return np.empty(0), np.empty(0)
+            self.level = float(envelope[:learn].max())
+            self.quiet_since = times[learn - 1]
+        beats, rates = [], []
+        step = max(int(QRS_BLOCK * self.sample_rate), 1)
+        max_width = int(QRS_MAX_WIDTH * self.sample_rate)
+        for stop in range(step, len(envelope) + step, step):
+            stop = min(stop, len(envelope))
+            segment = envelope[resolved:stop]
+            above = np.concatenate(([False], segment > QRS_THRESHOLD * self.level, [False]))
+            edges = np.flatnonzero(above[1:] != above[:-1])
+            starts, ends = edges[::2], edges[1::2]
+            done = stop
+            if len(starts) and ends[-1] == len(segment) and ends[-1] - starts[-1] < max_width:
+                # The last QRS may go on in the next block
+                done = resolved + starts[-1]
+                starts, ends = starts[:-1], ends[:-1]
+            for start, end in zip(starts, ends):
+                peak = resolved + start + int(np.argmax(segment[start:end]))
+                beat = times[peak]
+                if self.last_beat is not None and beat - self.last_beat < QRS_REFRACTORY:
+                    continue
+                if self.last_beat is not None and beat - self.last_beat <= QRS_MAX_RR:
+                    beats.append(beat)
+                    rates.append(60.0 / (beat - self.last_beat))
+                self.last_beat = self.quiet_since = beat
+                self.level = 0.875 * self.level + 0.125 * float(envelope[peak])
+            if done > resolved and times[done - 1] - self.quiet_since > QRS_MAX_RR:
+                self.level *= 0.5  # Beats got smaller or were missed
+                self.quiet_since = times[done - 1]
+            resolved = done
+        self.pending_envelope, self.pending_times = envelope[resolved:], times[resolved:]
+        return np.asarray(beats), np.asarray(rates)
+
+class LinkGroup:
+    """Panels sharing one x view and one playback clock.
+
+    A pan or zoom of any member is computed once and pushed to the others. The clock counts seconds since
+    the first sample of each channel, so linked panels with different sampling rates stay on the same instant.
+    """
+    def __init__(self, members, position=0.0):
+        self.members = list(members)
+        self.position = position  # Seconds played
+
+class GlueEngine:
+    """Joins a window of one signal to a window of another, separated by a gap (an overlap when negative).
+
+    Windows are (pyramid, start, stop) sample ranges of their source, used as views. Only the seam between
+    them is computed, so changing the gap or the interpolation redoes a few samples, not the glued signal.
+    """
+    def __init__(self):
+        self.head = None
+        self.tail = None
+        self.gap = 0.0  # Seconds between the end of the head and the start of the tail
+        self.method = 'linear'
+        self.head_stop = 0  # Head samples (from the window start) kept before the seam
+        self.tail_start = 0  # Tail samples (from the window start) replaced by the seam
+        self.tail_offset = 0.0  # Time shift that moves the tail behind the head
+        self.seam = None  # Pyramid over the computed seam samples
+        self.glued = None  # Materialised (time, amplitude), built on demand
+        self.part_stats = {}  # RunningStats of the head, seam and tail ranges
+
+    def set_windows(self, head, tail):
+        self.head = head
+        self.tail = tail
+        self.update_seam()
+
+    def set_gap(self, gap, method):
+        if (gap, method) != (self.gap, self.method):
+            self.gap = gap
+            self.method = method
+            if self.head is not None:
+                self.update_seam()
+
+    @staticmethod
+    def window(part):
+        pyramid, start, stop = part
+        return pyramid.time[start:stop], pyramid.amplitude[start:stop]
+
+    def update_seam(self):
+        head_time, head_amplitude = self.window(self.head)
+        tail_time, tail_amplitude = self.window(self.tail)
+        step = 1.0 / estimate_sample_rate(head_time)
+        end = head_time[-1]
+        # An overlap can't be longer than either window
+        gap = max(self.gap, -min(end - head_time[0], tail_time[-1] - tail_time[0]))
+        first = end + step + gap  # Where the first tail sample lands
+        self.tail_offset = first - tail_time[0]
+
+        if first > end:
+            # Gap: fill it at the head's sampling rate
+            self.head_stop = len(head_time)
+            self.tail_start = 0
+            count = max(int(np.ceil((first - end) / step)) - 1, 0)
+            seam_time = end + step * np.arange(1, count + 1)
+            seam_amplitude = self.bridge(seam_time, head_time, head_amplitude, tail_time, tail_amplitude, first)
+        else:
+            # Overlap: cross-fade from the head to the tail over the shared span
+            self.head_stop = int(np.searchsorted(head_time, first))
+            self.tail_start = int(np.searchsorted(tail_time, end - self.tail_offset, side='right'))
+            seam_time = head_time[self.head_stop:]
+            tail_on_head = np.interp(seam_time, tail_time[:self.tail_start] + self.tail_offset,
+                                     tail_amplitude[:self.tail_start])
+            weight = (seam_time - first) / max(end - first, step)
+            if self.method == 'cubic':
+                weight = weight * weight * (3 - 2 * weight)  # Smooth at both ends of the fade
+            seam_amplitude = (1 - weight) * head_amplitude[self.head_stop:] + weight * tail_on_head
+        self.seam = MinMaxPyramid(seam_time, seam_amplitude)
+        self.glued = None
+
+    def bridge(self, seam_time, head_time, head_amplitude, tail_time, tail_amplitude, first):
+        """Interpolate from the last head sample to the first (shifted) tail sample."""
+        end, start_value, end_value = head_time[-1], head_amplitude[-1], tail_amplitude[0]
+        if self.method != 'cubic':
+            return np.interp(seam_time, [end, first], [start_value, end_value])
+        # Cubic Hermite matching the slope on both sides of the gap
+        span = first - end
+        start_slope = (np.diff(head_amplitude[-2:]) / np.diff(head_time[-2:]))[0] if len(head_time) > 1 else 0.0
+        end_slope = (np.diff(tail_amplitude[:2]) / np.diff(tail_time[:2]))[0] if len(tail_time) > 1 else 0.0
+        s = (seam_time - end) / span
+        s2, s3 = s * s, s * s * s
+        return ((2 * s3 - 3 * s2 + 1) * start_value + (s3 - 2 * s2 + s) * span * start_slope
+                + (3 * s2 - 2 * s3) * end_value + (s3 - s2) * span * end_slope)
+
+    def parts(self):
+        """(pyramid, start, stop, time offset) of the head, seam and tail, in order."""
+        head_pyramid, head_start, _ = self.head
+        tail_pyramid, tail_start, tail_stop = self.tail
+        return [(head_pyramid, head_start, head_start + self.head_stop, 0.0),
+                (self.seam, 0, len(self.seam.amplitude), 0.0),
+                (tail_pyramid, tail_start + self.tail_start, tail_stop, self.tail_offset)]
+
+    def __len__(self):
+        return sum(stop - start for _, start, stop, _ in self.parts())
+
+    def decimate(self, x_min, x_max, max_points):
+        """At most about max_points points of the glued signal between x_min and x_max."""
+        ranges = []
+        for pyramid, start, stop, offset in self.parts():
+            time = pyramid.time[start:stop]
+            ranges.append((pyramid, start + int(np.searchsorted(time, x_min - offset)),
+                           start + int(np.searchsorted(time, x_max - offset, side='right')), offset))
+        total = max(sum(stop - start for _, start, stop, _ in ranges), 1)
+        xs, ys = [], []
+        for pyramid, start, stop, offset in ranges:
+            if stop > start:
+                # Each part gets its share of the points
+                x, y = pyramid.decimate(start, stop, max(2, max_points * (stop - start) // total))
+                xs.append(x + offset if offset else x)
+                ys.append(y)
+        if not xs:
+            return np.empty(0), np.empty(0)
+        return np.concatenate(xs), np.concatenate(ys)
+
+    def stats(self):
+        """Statistics of the glued signal; windows are summarised once, the seam whenever it changes."""
+        part_stats = {}
+        total = RunningStats()
+        for pyramid, start, stop, _ in self.parts():
+            key = (id(pyramid), start, stop)
+            if key not in self.part_stats:
+                self.part_stats[key] = RunningStats()
+                self.part_stats[key].extend(pyramid.amplitude[start:stop])
+            part_stats[key] = self.part_stats[key]
+            total.merge(part_stats[key])
+        self.part_stats = part_stats  # Forget ranges that are no longer part of the glue
+        return total
+
+    def concatenate(self):
+        """The glued signal as contiguous arrays (cached until the windows or the seam change)."""
+        if self.glued is None:
+            parts = self.parts()
+            self.glued = (np.concatenate([pyramid.time[start:stop] + offset for pyramid, start, stop, offset in parts]),
+                          np.concatenate([pyramid.amplitude[start:stop] for pyramid, start, stop, _ in parts]))
+        return self.glued
+
+def profiled(method):
+    """Time a MainWindow callback with the window's FrameProfiler; a single flag check while it is off."""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self):
+        profiler = self.profiler
+        if not profiler.enabled:
+            return method(self)
+        started = time.perf_counter()
+        try:
+            return method(self)
+        finally:
+            profiler.record(name, started, time.perf_counter() - started)
+    return wrapper
+
+class FrameProfiler:
+    """Optional timing of the timer callbacks and HTTP polls: duration histograms, late/missed ticks, samples and
+    points per graph."""
+    def __init__(self, trace_size=PROFILE_TRACE_SIZE):
+        self.enabled = False
+        self.intervals = {}  # Expected seconds between calls of timer-driven callbacks
+        self.trace = deque(maxlen=trace_size)  # (start, callback, duration, ticks missed before it)
+        self.reset()
+
+    def reset(self):
+        self.callbacks = {}  # Name -> [calls, total s, max s, late calls, missed ticks, histogram counts]
+        self.last_start = {}
+        self.samples = {}  # Samples rendered per graph since the last rate update
+        self.sample_rates = {}
+        self.points = {}  # Points handed to the curves of each graph by the last redraw
+        self.rate_time = time.perf_counter()
+        self.trace.clear()
+
+    def set_interval(self, name, interval):
+        self.intervals[name] = interval
+
+    def record(self, name, started, duration):
+        entry = self.callbacks.get(name)
+        if entry is None:
+            entry = self.callbacks[name] = [0, 0.0, 0.0, 0, 0, [0] * (len(PROFILE_BINS) + 1)]
+        entry[0] += 1
+        entry[1] += duration
+        entry[2] = max(entry[2], duration)
+        entry[5][bisect.bisect(PROFILE_BINS, duration)] += 1
+
+        # A tick is late when it comes more than half an interval after it was due
+        missed = 0
+        interval = self.intervals.get(name)
+        previous = self.last_start.get(name)
+        if interval and previous is not None:
+            gap = started - previous
+            if gap > PROFILE_LATE_FACTOR * interval:
+                entry[3] += 1
+                missed = max(int(round(gap / interval)) - 1, 0)
+                entry[4] += missed
+        self.last_start[name] = started
+        self.trace.append((started, name, duration, missed))
+
+    def count_samples(self, graph_name, count):
+        self.samples[graph_name] = self.samples.get(graph_name, 0) + count
+
+    def update_rates(self):
+        """Turn the samples counted since the last call into samples per second."""
+        now = time.perf_counter()
+        elapsed = now - self.rate_time
+        if elapsed > 0:
+            self.sample_rates = {graph_name: count / elapsed for graph_name, count in self.samples.items()}
+        self.samples = {}
+        self.rate_time = now
+
+    def percentile(self, name, q):
+        """Upper edge of the histogram bin holding the q-th quantile of a callback's durations."""
+        calls, _, maximum, _, _, counts = self.callbacks[name]
+        index = int(np.searchsorted(np.cumsum(counts), q * calls))
+        return PROFILE_BINS[index] if index < len(PROFILE_BINS) else maximum
+
+    def summary(self):
+        callbacks = {}
+        for name, (calls, total, maximum, late, missed, counts) in self.callbacks.items():
+            callbacks[name] = {'calls': calls, 'mean_ms': 1000 * total / calls, 'p95_ms': 1000 * self.percentile(name, 0.95),
+                               'max_ms': 1000 * maximum, 'late_ticks': late, 'missed_ticks': missed,
+                               'histogram': {'bin_edges_ms': [1000 * edge for edge in PROFILE_BINS], 'counts': counts}}
+        return {'callbacks': callbacks, 'samples_per_second': self.sample_rates, 'points_drawn': self.points}
+
+    def overlay_text(self):
+        lines = []
+        for name, values in self.summary()['callbacks'].items():
+            lines.append(f"{name}: {values['calls']} calls, mean {values['mean_ms']:.2f} ms, "
+                         f"p95 {values['p95_ms']:.2f} ms, max {values['max_ms']:.1f} ms"
+                         + (f", late {values['late_ticks']}, missed {values['missed_ticks']}"
+                            if name in self.intervals else ""))
+        for graph_name in sorted(set(self.sample_rates) | set(self.points)):
+            lines.append(f"{graph_name}: {self.sample_rates.get(graph_name, 0):.0f} samples/s, "
+                         f"{self.points.get(graph_name, 0)} points drawn")
+        return '\n'.join(lines) or "Profiling: no callbacks yet"
+
+    def export(self, file_name):
+        """Write the trace as CSV (one row per call) or the summary plus trace as JSON, by extension."""
+        if file_name.lower().endswith('.json'):
+            data = self.summary()
+            data['trace'] = [{'time': started, 'callback': name, 'duration_ms': 1000 * duration, 'missed_ticks': missed}
+                             for started, name, duration, missed in self.trace]
+            with open(file_name, 'w') as f:
+                json.dump(data, f, indent=1)
+            return
+        with open(file_name, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['time', 'callback', 'duration_ms', 'missed_ticks'])
+            for started, name, duration, missed in self.trace:
+                writer.writerow([f"{started:.6f}", name, f"{1000 * duration:.4f}", missed])
+
+class SignalLoader(QThread):
+    """Parses a CSV (time, channel columns...) or TXT (amplitude only) file in chunks on a worker thread."""
+    chunk_loaded = pyqtSignal(str, object, object)  # Load key, time (None for TXT files), (rows, channels) amplitudes
+    progress = pyqtSignal(int)  # Percent of the file read so far
+    loading_done = pyqtSignal(str, bool)  # Load key, whether the whole file was read
+    failed = pyqtSignal(str)
+
+    def __init__(self, graph_name, file_name, text_file=False, chunk_rows=LOADER_CHUNK_ROWS, parent=None):
+        super().__init__(parent)
+        self.graph_name = graph_name  # Key the chunks are tagged with
+        self.file_name = file_name
+        self.text_file = text_file
+        self.chunk_rows = chunk_rows
+
+    def run(self):
+        import pandas as pd  # Imported on the loader thread the first time a file is opened
+        total_size = max(os.path.getsize(self.file_name), 1)
+        completed = False
+        try:
+            dtypes = None if self.text_file else csv_dtypes(csv_shape(self.file_name)[1])
+            with open(self.file_name, 'rb') as f:
+                reader = pd.read_csv(f, header=None, sep=r'\s+' if self.text_file else ',',
+                                     dtype=dtypes, chunksize=self.chunk_rows)
+                for chunk in reader:
+                    if self.isInterruptionRequested():
+                        break
+                    if self.text_file:
+                        self.chunk_loaded.emit(self.graph_name, None, chunk.to_numpy(dtype=np.float64).ravel())
+                    else:
+                        times = chunk[0].to_numpy(dtype=np.float64)
+                        finite = np.isfinite(times)
+                        if not finite.all():
+                            chunk, times = chunk[finite], times[finite]  # Blank rows (a trailing ',') have no time
+                        # All channel columns of the chunk in one block
+                        self.chunk_loaded.emit(self.graph_name, times, chunk.iloc[:, 1:].to_numpy(dtype=CHANNEL_DTYPE))
+                    self.progress.emit(int(100 * f.tell() / total_size))
+                else:
+                    completed = True
+        except (OSError, ValueError) as e:
+            self.failed.emit(f"Could not load {self.file_name}: {e}")
+        self.loading_done.emit(self.graph_name, completed)
+
+class AcquisitionWorker(QThread):
+    """Polls a real-time HTTP JSON source off the GUI thread and queues (graph, time, value) samples."""
+    def __init__(self, graph_name, url, sample_queue, poll_interval=DEFAULT_POLL_INTERVAL, parent=None):
+        super().__init__(parent)
+        self.graph_name = graph_name
+        self.url = url
+        self.sample_queue = sample_queue
+        self.poll_interval = poll_interval / 1000  # Seconds, may be changed while running
+        self.stop_event = threading.Event()
+        self.capture = None  # CaptureWriter logging every received sample, set before start()
+        # Measurements read by the GUI
+        self.latency = None  # Smoothed request round trip in seconds
+        self.polls = deque(maxlen=PROFILE_POLL_BACKLOG)  # (start, round trip) of every poll, for the profiler
+        self.received = 0
+        self.dropped = 0  # Samples discarded because the GUI queue was full
+        self.errors = 0
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self):
+        import requests
+        # One keep-alive connection reused for every poll
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        backoff = 0.0
+        try:
+            while not self.stop_event.is_set():
+                started = time.perf_counter()
+                try:
+                    response = session.get(self.url, timeout=REQUEST_TIMEOUT)
+                    response.raise_for_status()  # Raise an error for bad responses
+                    data = response.json()  # Parse JSON response
+                    elapsed = time.perf_counter() - started
+                    self.latency = elapsed if self.latency is None else 0.8 * self.latency + 0.2 * elapsed
+                    self.polls.append((started, elapsed))
+                    if 'price' not in data:
+                        raise ValueError("'price' key not found in the response")
+                    self.queue_sample(time.time(), float(data['price']))
+                    backoff = 0.0
+                except (requests.exceptions.RequestException, ValueError, TypeError) as e:
+                    self.errors += 1
+                    # Back off exponentially while the source keeps failing
+                    backoff = min(max(2 * backoff, self.poll_interval), MAX_BACKOFF)
+                    print(f"Error polling {self.url}: {e}")
+                delay = backoff or self.poll_interval - (time.perf_counter() - started)
+                self.stop_event.wait(max(delay, 0))
+        finally:
+            session.close()
+            if self.capture is not None:
+                self.capture.close()
+
+    def queue_sample(self, timestamp, value):
+        self.received += 1
+        times, values = np.array([timestamp]), np.array([value])
+        if self.capture is not None:
+            self.capture.append(times, values)
+        try:
+            self.sample_queue.put_nowait((self.graph_name, times, values))
+        except queue.Full:
+            self.dropped += 1
+
+class SocketIngestWorker(QThread):
+    """Listens on one TCP or UDP port and queues every received packet as one batch of samples.
+
+    Text packets carry newline-delimited "value" or "time,value" lines; binary packets carry little-endian
+    (time, value) records, a float64 time (absolute epoch seconds need it) and a float32 (format=f32) or
+    float64 (format=f64) value.
+    """
+    def __init__(self, graph_name, url, sample_queue, parent=None):
+        super().__init__(parent)
+        self.graph_name = graph_name
+        self.url = url
+        parts = urlsplit(url)
+        options = parse_qs(parts.query)
+        self.protocol = parts.scheme
+        self.address = (parts.hostname or '0.0.0.0', parts.port)
+        self.format = options.get('format', ['text'])[0]
+        self.rate = float(options.get('rate', [DEFAULT_SOCKET_RATE])[0])
+        self.sample_queue = sample_queue
+        self.stop_event = threading.Event()
+        self.pending = b''  # Partial line or sample carried over to the next packet
+        self.sample_count = 0
+        self.start_time = None
+        self.capture = None  # CaptureWriter logging every received batch, set before start()
+        # Measurements read by the GUI
+        self.latency = None
+        self.received = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self):
+        kind = socket.SOCK_STREAM if self.protocol == 'tcp' else socket.SOCK_DGRAM
+        try:
+            with socket.socket(socket.AF_INET, kind) as server:
+                server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                server.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+                server.bind(self.address)
+                server.settimeout(SOCKET_POLL_TIMEOUT)
+                if kind == socket.SOCK_STREAM:
+                    server.listen(1)
+                    self.serve_tcp(server)
+                else:
+                    self.receive_from(server)
+        except OSError as e:
+            self.errors += 1
+            print(f"Error listening on {self.url}: {e}")
+        finally:
+            if self.capture is not None:
+                self.capture.close()
+
+    def serve_tcp(self, server):
+        while not self.stop_event.is_set():
+            try:
+                connection, _ = server.accept()
+            except socket.timeout:
+                continue
+            with connection:
+                connection.settimeout(SOCKET_POLL_TIMEOUT)
+                self.pending = b''
+                self.receive_from(connection)
+
+    def receive_from(self, sock):
+        while not self.stop_event.is_set():
+            try:
+                packet = sock.recv(SOCKET_RECEIVE_SIZE)
+            except socket.timeout:
+                continue
+            if not packet and sock.type == socket.SOCK_STREAM:
+                return  # Sender closed the connection
+            try:
+                self.queue_batch(*self.parse_packet(packet))
+            except ValueError as e:
+                self.errors += 1
+                print(f"Malformed packet on {self.url}: {e}")
+
+    def parse_packet(self, packet):
+        """Turn one packet into time and value arrays with a single vectorized parse."""
+        data = self.pending + packet
+        if self.format in ('f32', 'f64'):
+            record = np.dtype([('time', '<f8'), ('value', '<f4' if self.format == 'f32' else '<f8')])
+            usable = len(data) // record.itemsize * record.itemsize
+            self.pending = data[usable:]
+            records = np.frombuffer(data[:usable], dtype=record)
+            return records['time'].astype(np.float64), records['value'].astype(np.float64)
+
+        end = data.rfind(b'\n') + 1
+        self.pending = data[end:]
+        lines = data[:end]
+        columns = 2 if b',' in lines[:lines.find(b'\n')] else 1
+        values = np.array(lines.replace(b',', b' ').split(), dtype=np.float64)
+        if columns == 2:
+            values = values.reshape(-1, 2)
+            return values[:, 0], values[:, 1]
+        # Value-only lines are stamped from the nominal sampling rate
+        if self.start_time is None:
+            self.start_time = time.time()
+        times = self.start_time + (self.sample_count + np.arange(len(values))) / self.rate
+        self.sample_count += len(values)
+        return times, values
+
+    def queue_batch(self, times, values):
+        if len(values) == 0:
+            return
+        self.received += len(values)
+        # Logged as received, even if the GUI can't keep up and the batch is dropped below
+        if self.capture is not None:
+            self.capture.append(times, values)
+        try:
+            self.sample_queue.put_nowait((self.graph_name, times, values))
+        except queue.Full:
+            self.dropped += len(values)
+
+class CaptureWriter:
+    """Append-only capture log of a live source: a header naming the source, then timestamped sample blocks."""
+    def __init__(self, path, source):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # Blocks are collected in a large buffer and reach the disk in bulk writes
+        self.file = open(path, 'ab', buffering=CAPTURE_BUFFER_SIZE)
+        if self.file.tell() == 0:
+            encoded = source.encode('utf-8')
+            self.file.write(CAPTURE_HEADER.pack(CAPTURE_MAGIC, CAPTURE_VERSION, len(encoded)) + encoded)
+        self.last_flush = time.perf_counter()
+        self.samples = 0
+
+    def append(self, times, values, received_at=None):
+        """Log one batch as it arrives; the arrays are written from their own memory, without a copy."""
+        received_at = time.time() if received_at is None else received_at
+        self.file.write(CAPTURE_BLOCK_HEADER.pack(received_at, len(values)))
+        self.file.write(memoryview(np.ascontiguousarray(times, dtype='<f8')))
+        self.file.write(memoryview(np.ascontiguousarray(values, dtype='<f8')))
+        self.samples += len(values)
+        now = time.perf_counter()
+        if now - self.last_flush > CAPTURE_FLUSH_INTERVAL:
+            self.file.flush()
+            self.last_flush = now
+
+    def close(self):
+        self.file.close()
+
+def read_capture(path):
+    """Source URL of a capture log and a generator of its (receive time, times, values) blocks."""
+    f = open(path, 'rb', buffering=CAPTURE_BUFFER_SIZE)
+    header = f.read(CAPTURE_HEADER.size)
+    if len(header) < CAPTURE_HEADER.size:
+        f.close()
+        raise ValueError(f"{path} is too short to be a capture log")
+    magic, version, source_size = CAPTURE_HEADER.unpack(header)
+    if magic != CAPTURE_MAGIC or version != CAPTURE_VERSION:
+        f.close()
+        raise ValueError(f"{path} is not a version {CAPTURE_VERSION} capture log")
+    source = f.read(source_size).decode('utf-8', errors='replace')
+
+    def blocks():
+        with f:
+            while True:
+                block_header = f.read(CAPTURE_BLOCK_HEADER.size)
+                if len(block_header) < CAPTURE_BLOCK_HEADER.size:
+                    return
+                received_at, count = CAPTURE_BLOCK_HEADER.unpack(block_header)
+                data = f.read(16 * count)
+                if len(data) < 16 * count:
+                    return  # Last block cut short, e.g. by a crash while recording
+                samples = np.frombuffer(data, dtype='<f8')
+                yield received_at, samples[:count], samples[count:]
+    return source, blocks()
+
+class ReplayWorker(QThread):
+    """Feeds a capture log into the live queue, like the source that was recorded, at 1x, Nx or maximum speed.
+
+    The address is replay://path/to/file.cap with an optional ?speed=N or ?speed=max (default 1).
+    Batches are never dropped: the worker waits for room in the queue, so every replay draws the same data.
+    """
+    def __init__(self, graph_name, url, sample_queue, parent=None):
+        super().__init__(parent)
+        self.graph_name = graph_name
+        self.url = url
+        parts = urlsplit(url)
+        self.path = parts.netloc + parts.path
+        speed = parse_qs(parts.query).get('speed', ['1'])[0]
+        self.speed = None if speed == 'max' else float(speed)
+        if self.speed is not None and self.speed <= 0:
+            raise ValueError("speed must be positive or 'max'")
+        self.source, self.blocks = read_capture(self.path)
+        self.sample_queue = sample_queue
+        self.stop_event = threading.Event()
+        self.capture = None  # A replay can itself be recorded
+        # Measurements read by the GUI
+        self.latency = None
+        self.received = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self):
+        first_received = started = None
+        pending = []
+        try:
+            for received_at, times, values in self.blocks:
+                if self.stop_event.is_set():
+                    return
+                if self.speed is None:
+                    # As fast as the GUI drains the queue, in large batches
+                    pending.append((times, values))
+                    if sum(len(v) for _, v in pending) >= REPLAY_BATCH:
+                        self.queue_batch(pending)
+                        pending = []
+                    continue
+                # Keep the recorded spacing between blocks, scaled by the speed
+                if first_received is None:
+                    first_received, started = received_at, time.perf_counter()
+                due = started + (received_at - first_received) / self.speed
+                if self.stop_event.wait(max(due - time.perf_counter(), 0)):
+                    return
+                self.queue_batch([(times, values)])
+            self.queue_batch(pending)
+        except OSError as e:
+            self.errors += 1
+            print(f"Error replaying {self.path}: {e}")
+        finally:
+            self.blocks.close()
+            if self.capture is not None:
+                self.capture.close()
+
+    def queue_batch(self, blocks):
+        if not blocks:
+            return
+        times = np.concatenate([block[0] for block in blocks])
+        values = np.concatenate([block[1] for block in blocks])
+        if self.capture is not None:
+            self.capture.append(times, values)
+        while not self.stop_event.is_set():
+            try:
+                self.sample_queue.put((self.graph_name, times, values), timeout=SOCKET_POLL_TIMEOUT)
+                self.received += len(values)
+                return
+            except queue.Full:
+                continue
+
+class SignalFile:
+    """Memory-mapped view of a binary .sig recording: header, time column, amplitude columns and block index."""
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            header = f.read(SIGNAL_FILE_HEADER.size)
+        if len(header) < SIGNAL_FILE_HEADER.size:
+            raise ValueError(f"{path} is too short to be a signal file")
+        (magic, version, time_size, amplitude_size, self.channel_count, self.sample_count,
+         self.block_size, data_offset, index_offset) = SIGNAL_FILE_HEADER.unpack(header)
+        if magic != SIGNAL_FILE_MAGIC or version != SIGNAL_FILE_VERSION:
+            raise ValueError(f"{path} is not a version {SIGNAL_FILE_VERSION} signal file")
+
+        time_dtype = np.dtype(f'<f{time_size}')
+        amplitude_dtype = np.dtype(f'<f{amplitude_size}')
+        # Nothing is read here; pages are loaded by the OS when a range is drawn
+        self.time = np.memmap(path, dtype=time_dtype, mode='r', offset=data_offset, shape=(self.sample_count,))
+        self.channels = np.memmap(path, dtype=amplitude_dtype, mode='r',
+                                  offset=data_offset + self.sample_count * time_size,
+                                  shape=(self.channel_count, self.sample_count))
+        block_count = -(-self.sample_count // self.block_size)
+        # One row per block: first timestamp, then min and max of every channel
+        self.block_index = np.memmap(path, dtype='<f8', mode='r', offset=index_offset,
+                                     shape=(block_count, 1 + 2 * self.channel_count))
+
+    @property
+    def amplitude(self):
+        return self.channels[0]
+
+    def pyramid(self, channel=0):
+        """Level-of-detail pyramid seeded from the block index, without touching the samples."""
+        return MinMaxPyramid(self.time, self.channels[channel], base_factor=self.block_size,
+                             base_mins=self.block_index[:, 1 + 2 * channel],
+                             base_maxs=self.block_index[:, 2 + 2 * channel],
+                             base_times=self.block_index[:, 0])
+
+def write_signal_file(path, time, amplitudes, dtype=np.float32, block_size=DEFAULT_BLOCK_SIZE):
+    """Write time and one or more amplitude columns ((n_samples,) or (n_samples, n_channels)) as a .sig file."""
+    time = np.asarray(time, dtype='<f8')
+    amplitudes = np.asarray(amplitudes, dtype=np.dtype(dtype).newbyteorder('<'))
+    if amplitudes.ndim == 1:
+        amplitudes = amplitudes[:, None]
+    sample_count, channel_count = amplitudes.shape
+
+    block_starts = np.arange(0, sample_count, block_size)
+    block_index = np.empty((len(block_starts), 1 + 2 * channel_count), dtype='<f8')
+    if sample_count:
+        block_index[:, 0] = time[block_starts]
+        block_index[:, 1::2] = np.minimum.reduceat(amplitudes, block_starts, axis=0)
+        block_index[:, 2::2] = np.maximum.reduceat(amplitudes, block_starts, axis=0)
+
+    data_offset = SIGNAL_FILE_ALIGNMENT
+    data_size = sample_count * (time.itemsize + channel_count * amplitudes.itemsize)
+    index_offset = -(-(data_offset + data_size) // SIGNAL_FILE_ALIGNMENT) * SIGNAL_FILE_ALIGNMENT
+    header = SIGNAL_FILE_HEADER.pack(SIGNAL_FILE_MAGIC, SIGNAL_FILE_VERSION, time.itemsize, amplitudes.itemsize,
+                                     channel_count, sample_count, block_size, data_offset, index_offset)
+    with open(path, 'wb') as f:
+        f.write(header.ljust(data_offset, b'\0'))
+        f.write(time.tobytes())
+        # Columns are stored one after another so each channel maps as a contiguous array
+        for channel in range(channel_count):
+            f.write(np.ascontiguousarray(amplitudes[:, channel]).tobytes())
+        f.write(b'\0' * (index_offset - data_offset - data_size))
+        f.write(block_index.tobytes())
+
+def stats_table(named_stats):
+    """Report table rows for a list of (channel name, RunningStats)."""
+    if len(named_stats) == 1:
+        return [['Statistic', 'Value']] + [[name, f'{value:.5f}'] for name, value in named_stats[0][1].summary()]
+    # One row per channel when there are several
+    rows = [['Channel'] + [name for name, _ in named_stats[0][1].summary()]]
+    for channel_name, stats in named_stats:
+        rows.append([channel_name] + [f'{value:.5f}' for _, value in stats.summary()])
+    return rows
+
+def write_report(report_filename, snapshot, table_data, title="Biological Signal Report"):
+    """Write a report PDF: logos, title, a plot image (file name or ImageReader) and a statistics table."""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+    from reportlab.platypus import Table, TableStyle
+    # Create a canvas object
+    c = canvas.Canvas(report_filename, pagesize=letter)
+    width, height = letter
+
+    # Add images and text
+    logo_height = 70  # height of the logo in the header
+    c.drawImage(os.path.join(IMAGE_DIR, "uni-logo.png"), width - 150, height - logo_height - 40, width=100, height=logo_height)  # right side
+    c.drawImage(os.path.join(IMAGE_DIR, "sbme-logo.jpg"), 50, height - logo_height - 40, width=100, height=logo_height)  # left side
+
+    # Title in the middle
+    c.setFont("Helvetica-Bold", 22)
+    c.drawCentredString(width / 2, height - 90, title)
+
+    # Add the snapshot to the PDF
+    snapshot_y_position = height - logo_height - 100  # Adjust this to place it below the title
+    c.drawImage(snapshot, 50, snapshot_y_position - 200, width=500, height=200)  # Adjust positioning and size
+
+    # Create the table, its header repeated on every page it spans
+    column_count = len(table_data[0])
+    table = Table(table_data, colWidths=[200, 200] if column_count == 2 else [500 / column_count] * column_count,
+                  repeatRows=1)
+
+    # Add style to the table
+    style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.black),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ])
+    table.setStyle(style)
+
+    # Convert table into canvas elements, continuing on new pages for long tables
+    top = snapshot_y_position - 250
+    while table is not None:
+        parts = table.split(width, top - REPORT_MARGIN) or [table]
+        table_width, table_height = parts[0].wrapOn(c, width, height)
+        parts[0].drawOn(c, (width - table_width) / 2, top - table_height)
+        table = parts[1] if len(parts) > 1 else None
+        if table is not None:
+            c.showPage()
+            top = height - REPORT_MARGIN
+
+    # Finalize the PDF
+    c.showPage()
+    c.save()
+
+def read_csv_channels(file_name):
+    """Time column and (n_samples, n_channels) amplitude matrix of a CSV recording, parsed once.
+
+    The matrix is column-major so every channel is a contiguous column.
+    """
+    import pandas as pd
+    _, column_count = csv_shape(file_name)
+    data = pd.read_csv(file_name, header=None, dtype=csv_dtypes(column_count))
+    time = data[0].to_numpy(dtype=np.float64)
+    finite = np.isfinite(time)
+    if not finite.all():
+        data, time = data[finite], time[finite]  # Blank rows (a trailing ',') have no time
+    amplitudes = np.empty((len(data), column_count - 1), dtype=CHANNEL_DTYPE, order='F')
+    for column in range(1, column_count):
+        amplitudes[:, column - 1] = data[column].to_numpy()
+    return time, amplitudes
+
+def png_bytes(image):
+    """Encode a QImage as PNG in memory."""
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, 'PNG')
+    buffer.close()
+    return bytes(data)
+
+class ExportWorker(QThread):
+    """Encodes a captured plot image and writes the snapshot PNG and/or report PDF off the GUI thread."""
+    saved = pyqtSignal(str)  # Message naming the written file
+    failed = pyqtSignal(str)
+
+    def __init__(self, image, snapshot_filename=None, report_filename=None, table_data=None, parent=None):
+        super().__init__(parent)
+        self.image = image  # QImage, safe to read from another thread (unlike QPixmap)
+        self.snapshot_filename = snapshot_filename
+        self.report_filename = report_filename
+        self.table_data = table_data
+
+    def run(self):
+        from reportlab.lib.utils import ImageReader
+        try:
+            png = png_bytes(self.image)
+            if self.snapshot_filename:
+                os.makedirs(os.path.dirname(self.snapshot_filename) or '.', exist_ok=True)
+                with open(self.snapshot_filename, 'wb') as f:
+                    f.write(png)
+                self.saved.emit(f"Snapshot saved to {self.snapshot_filename}")
+            if self.report_filename:
+                os.makedirs(os.path.dirname(self.report_filename) or '.', exist_ok=True)
+                # The plot goes into the PDF straight from memory
+                write_report(self.report_filename, ImageReader(io.BytesIO(png)), self.table_data)
+                self.saved.emit(f"Report saved as {self.report_filename}")
+        except (OSError, ValueError) as e:
+            self.failed.emit(f"Export failed: {e}")
 
 class MoveDialog(QDialog):
     def __init__(self):
@@ -101,6 +1793,72 @@ class MoveDialog(QDialog):
 
         return source_graph, destination_graph
 
+class LinkDialog(QDialog):
+    def __init__(self, graph_names, linked):
+        super().__init__()
+
+        self.setWindowTitle("Link Graphs")
+        layout = QVBoxLayout()
+
+        # Checked graphs share their view, cursor and controls; one or none checked unlinks
+        link_group = QGroupBox("Select the graphs to link")
+        link_layout = QVBoxLayout()
+        self.graph_boxes = {}
+        for graph_name in graph_names:
+            box = QCheckBox(graph_name)
+            box.setChecked(graph_name in linked)
+            link_layout.addWidget(box)
+            self.graph_boxes[graph_name] = box
+        link_group.setLayout(link_layout)
+        layout.addWidget(link_group)
+
+        # OK/Cancel buttons
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        self.setLayout(layout)
+
+    def get_linked_graphs(self):
+        return [graph_name for graph_name, box in self.graph_boxes.items() if box.isChecked()]
+
+class ChannelDialog(QDialog):
+    def __init__(self, file_name, channel_count, default_graph):
+        super().__init__()
+
+        self.setWindowTitle("Select Channels")
+        layout = QVBoxLayout()
+
+        # One graph selector per channel; channels left on "None" are not shown
+        channel_group = QGroupBox(f"Select a graph for each channel of {os.path.basename(file_name)}")
+        channel_layout = QGridLayout()
+        self.channel_boxes = []
+        for channel in range(channel_count):
+            box = QComboBox()
+            box.addItems(['None', 'Graph 1', 'Graph 2', 'Glued Signals'])
+            if channel == 0:
+                box.setCurrentText(default_graph)
+            row, column = channel % MAX_DIALOG_ROWS, 2 * (channel // MAX_DIALOG_ROWS)
+            channel_layout.addWidget(QLabel(f"Channel {channel + 1}"), row, column)
+            channel_layout.addWidget(box, row, column + 1)
+            self.channel_boxes.append(box)
+        channel_group.setLayout(channel_layout)
+        layout.addWidget(channel_group)
+
+        # OK/Cancel buttons
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        self.setLayout(layout)
+
+    def get_channel_graphs(self):
+        """Graph chosen for every shown channel, by column index."""
+        return {channel: box.currentText() for channel, box in enumerate(self.channel_boxes)
+                if box.currentText() != 'None'}
+
 
 
 
@@ -118,14 +1876,29 @@ class CircleGraph(QWidget):
         self.button.clicked.connect(self.toggle_play_pause)
         # Initialize color
         self.color = Qt.red
+        # Screen coordinates of every sample and the trace drawn so far, rebuilt when the data,
+        # zoom, size or color change
+        self.trace_key = None
+        self.points = None
+        self.coordinates = None
+        self.trace = None
+        self.drawn_count = 0
+        # Disc and grid never change between frames, they are rendered once per size
+        self.background = None
+        self.label_rect = None  # Area of the last drawn amplitude label
 
     # Initialize QTimer for animation
         self.circular_timer = QTimer()
         self.circular_timer.timeout.connect(self.update_circular_graph)
         self.start_animation()  # Start the animation automatically
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
+    def build_background(self):
+        """Render the black disc, concentric circles and radial lines into a pixmap."""
+        ratio = self.devicePixelRatioF()
+        self.background = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+        self.background.setDevicePixelRatio(ratio)
+        self.background.fill(Qt.transparent)
+        painter = QPainter(self.background)
 
         # Define the center and radius for the circle
         center_x, center_y = self.width() // 2, self.height() // 2
@@ -151,44 +1924,113 @@ class CircleGraph(QWidget):
             x = center_x + radius * np.cos(np.radians(angle))
             y = center_y + radius * np.sin(np.radians(angle))
             painter.drawLine(center_x, center_y, int(x), int(y))  # Line from center to edge
+        painter.end()
+
+    def resizeEvent(self, event):
+        self.background = None  # Rebuilt on the next paint
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        if self.background is None:
+            self.build_background()
+        # Blits are clipped to the invalidated region by the painter
+        painter.drawPixmap(0, 0, self.background)
 
         # Plot points with respect to time
-        if self.show_points and self.data is not None:
-            angles = np.linspace(0, 2 * np.pi, len(self.data))  # Spread points around the circle
-            previous_point = None  # To connect lines between points
-
-            # Find the index of the current point based on the angle
-            current_index = np.argmax(angles >= self.angle) - 1
-            if current_index < 0:
-                current_index = 0
-
-            for idx, value in enumerate(self.data):
-                if angles[idx] <= self.angle:  # Plot with time
-                    point_radius = value  # Scale for plotting     
-                    x = (point_radius * self.circular_zoom_level) * np.cos(angles[idx])  # Adjusted position calculation
-                    y = (point_radius * self.circular_zoom_level) * np.sin(angles[idx])  # Adjusted position calculation
-
-                    # Draw red points
-                    painter.setBrush(QBrush(self.color))
-                    painter.drawEllipse(int(center_x + x) - 2, int(center_y + y) - 2, 4, 4)
-
-                    # Draw lines connecting points
-                    if previous_point is not None:
-                        painter.setPen(QPen(self.color, 0.9))  # Set line color and width
-                        painter.drawLine(previous_point[0], previous_point[1], int(center_x + x), int(center_y + y))
-
-                    previous_point = (int(center_x + x), int(center_y + y))  # Update the previous point
-
-                    # Draw amplitude label only for the current detected point
-                    if idx == current_index:  # Check if this is the current detected index
-                        painter.setPen(QPen(Qt.white, 0.9))
-                        painter.drawText(int(center_x + x) + 5, int(center_y + y) - 5, f"{value:.1f}")
+        if self.show_points and self.data is not None and len(self.data):
+            self.update_trace()
+            painter.drawPixmap(0, 0, self.trace)
+
+            # Draw amplitude label only for the current detected point
+            current_index = max(self.visible_count() - 1, 0)
+            point = self.points.at(current_index)
+            painter.setPen(QPen(Qt.white, 0.9))
+            painter.drawText(int(point.x()) + 5, int(point.y()) - 5, f"{self.data[current_index]:.1f}")
+            self.label_rect = self.label_area(point)
+
+    def label_area(self, point):
+        """Rectangle covered by the amplitude label drawn next to point."""
+        metrics = self.fontMetrics()
+        return QRect(int(point.x()) + 4, int(point.y()) - 6 - metrics.ascent(), 8 * metrics.averageCharWidth(),
+                     metrics.height() + 4)
+
+    def sweep_region(self):
+        """Area that changes when the sweep advances to the current angle, or the whole widget."""
+        if (not self.show_points or self.data is None or not len(self.data) or self.background is None
+                or self.trace_key != self.cache_key()):
+            return self.rect()
+        visible = self.visible_count()
+        if visible < self.drawn_count:
+            return self.rect()  # Wrapped around, the old trace is erased
+        first = max(self.drawn_count - 1, 0)
+        arc = self.coordinates[first:max(visible, first + 1)]
+        # Bounding box of the new arc plus the pen width
+        left, top = np.floor(arc.min(axis=0)).astype(int) - 3
+        right, bottom = np.ceil(arc.max(axis=0)).astype(int) + 3
+        region = QRect(left, top, right - left, bottom - top)
+        region = region.united(self.label_area(self.points.at(max(visible - 1, 0))))
+        if self.label_rect is not None:
+            region = region.united(self.label_rect)  # Erase the previous label
+        return region
+
+    def visible_count(self):
+        """Number of samples whose angle has been reached, in O(1)."""
+        count = len(self.data)
+        if count < 2:
+            return count
+        # Samples are spread evenly from 0 to 2*pi, so sample i sits at i * 2*pi / (count - 1)
+        return min(int(self.angle * (count - 1) / (2 * np.pi)) + 1, count)
+
+    def cache_key(self):
+        return (id(self.data), len(self.data), self.circular_zoom_level, self.width(), self.height(),
+                QColor(self.color).rgba())
+
+    def update_trace(self):
+        """Bring the cached trace up to the current angle, drawing only the newly revealed arc."""
+        key = self.cache_key()
+        if key != self.trace_key:
+            self.trace_key = key
+            # Polar to screen coordinates for all samples at once, written straight into a QPolygonF
+            count = len(self.data)
+            angles = np.linspace(0, 2 * np.pi, count)  # Spread points around the circle
+            radii = np.asarray(self.data, dtype=np.float64) * self.circular_zoom_level
+            self.points = pg.functions.create_qpolygonf(count)
+            self.coordinates = pg.functions.ndarray_from_qpolygonf(self.points)
+            self.coordinates[:, 0] = self.width() // 2 + radii * np.cos(angles)
+            self.coordinates[:, 1] = self.height() // 2 + radii * np.sin(angles)
+
+            ratio = self.devicePixelRatioF()
+            self.trace = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+            self.trace.setDevicePixelRatio(ratio)
+            self.trace.fill(Qt.transparent)
+            self.drawn_count = 0
+
+        visible = self.visible_count()
+        if visible < self.drawn_count:
+            # The sweep wrapped around, start a new trace
+            self.trace.fill(Qt.transparent)
+            self.drawn_count = 0
+        if visible > self.drawn_count:
+            painter = QPainter(self.trace)
+            # Lines connecting points, continuing from the last drawn point
+            first = max(self.drawn_count - 1, 0)
+            painter.setPen(QPen(self.color, 0.9))
+            painter.drawPolyline(self.points.mid(first, visible - first))
+            # All new points in one call
+            point_pen = QPen(self.color, 4)
+            point_pen.setCapStyle(Qt.RoundCap)
+            painter.setPen(point_pen)
+            painter.drawPoints(self.points.mid(self.drawn_count, visible - self.drawn_count))
+            painter.end()
+            self.drawn_count = visible
+
     def update_circular_graph(self):
       if self.circular_is_playing:  # Only update angle if playing
         self.angle += np.pi / 90  # Update the angle at a fixed rate
         if self.angle >= 2 * np.pi:
             self.angle = 0  # Reset the angle after completing the circle
-        self.update()  # Trigger a repaint
+        self.update(self.sweep_region())  # Repaint only the part the sweep changed
     def zoom_in(self):
         self.circular_zoom_level *= 1.1  # Increase zoom level
         self.update()  # Redraw
@@ -245,32 +2087,30 @@ class MainWindow(QWidget):
         self.graph3_vertical_scroll = QScrollBar(Qt.Vertical)
         self.graph3_horizontal_scroll = QScrollBar(Qt.Horizontal)
         #Initialize previous values for scrollbars
-        self.prev_graph1_x_scroll = 0
         self.prev_graph1_y_scroll = 0
-        self.prev_graph2_x_scroll = 0
         self.prev_graph2_y_scroll = 0
-        self.prev_glued_x_scroll = 0
         self.prev_glued_y_scroll = 0
         self.prev_graph3_x_scroll = 0
         self.prev_graph3_y_scroll = 0
 
-
+        mark_startup('window_setup')
         self.initUI()
+        mark_startup('init_ui')
 
-        # Connect existing scrollbars to their respective methods
-        self.graph1_horizontal_scroll.setPageStep(10)    # Adjust step size
-        self.graph1_horizontal_scroll.setSingleStep(1)   # Fine-tune step size
-        self.graph1_horizontal_scroll.valueChanged.connect(self.graph1_x_scroll_moved)
+        # Horizontal scrollbars of the plot graphs are time scrubbers: dragging one seeks its graph
+        self.scrubbers = {
+            'Graph 1': self.graph1_horizontal_scroll,
+            'Graph 2': self.graph2_horizontal_scroll,
+            'Glued Signals': self.glued_horizontal_scroll
+        }
+        for graph_name, scrubber in self.scrubbers.items():
+            scrubber.setRange(0, SCRUB_STEPS)
+            scrubber.setPageStep(SCRUB_STEPS // 20)  # Clicking beside the handle jumps 5%
+            scrubber.setSingleStep(1)
+            scrubber.setToolTip("Drag to seek")
+            scrubber.valueChanged.connect(lambda value, graph_name=graph_name: self.scrub(graph_name, value))
         self.graph1_vertical_scroll.valueChanged.connect(self.graph1_y_scroll_moved)
-
-        self.graph2_horizontal_scroll.setPageStep(10)    # Adjust step size
-        self.graph2_horizontal_scroll.setSingleStep(1)   # Fine-tune step size
-        self.graph2_horizontal_scroll.valueChanged.connect(self.graph2_x_scroll_moved)
         self.graph2_vertical_scroll.valueChanged.connect(self.graph2_y_scroll_moved)
-
-        self.glued_horizontal_scroll.setPageStep(10)    # Adjust step size
-        self.glued_horizontal_scroll.setSingleStep(1)   # Fine-tune step size
-        self.glued_horizontal_scroll.valueChanged.connect(self.glued_x_scroll_moved)
         self.glued_vertical_scroll.valueChanged.connect(self.glued_y_scroll_moved)
 
         self.graph3_horizontal_scroll.setPageStep(10)    # Adjust step size
@@ -278,70 +2118,50 @@ class MainWindow(QWidget):
         self.graph3_horizontal_scroll.valueChanged.connect(self.graph3_x_scroll_moved)
         self.graph3_vertical_scroll.valueChanged.connect(self.graph3_y_scroll_moved)
         self.is_playing = False 
-        self.linked=False
+        self.link_groups = {}  # LinkGroup of every linked graph, one object shared by its members
+        self.syncing_views = False  # Set while a group view is being pushed
+
+        # Timing of the callbacks below, off until the Profile button is pressed
+        self.profiler = FrameProfiler()
 
+        # Single playback clock driving every graph, ticking at the display refresh rate
         self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.update_graphs)
 
-        self.sampling_rate = 50
-        self.timer_interval = int(1000 / self.sampling_rate)  # Convert to integer
+        screen = QApplication.primaryScreen()
+        refresh_rate = screen.refreshRate() if screen is not None else 0
+        self.refresh_rate = refresh_rate if refresh_rate > 0 else DEFAULT_REFRESH_RATE
+        self.timer_interval = int(1000 / self.refresh_rate)  # Convert to integer
+        self.profiler.set_interval('update_graphs', self.timer_interval / 1000)
+        self.playback_speed = 1.0  # Multiplier applied to every graph's own sampling rate
+        self.last_frame_time = None
 
         # Define sampling rates
-        self.update_graphs_sampling_rate = self.timer_interval  # 900 ms for graph updates
-        self.real_time_sampling_rate = 500      # 1000 ms for real-time updates
-        self.circular_graph_sampling_rate = 700  # 1300 ms for circular graph updates
+        self.real_time_sampling_rate = 500      # 500 ms for real-time updates
+        self.circular_graph_sampling_rate = 700  # 700 ms for circular graph updates
 
-        # Create a timer for updating graphs
-        self.update_graphs_timer = QTimer(self)
-        self.update_graphs_timer.timeout.connect(self.update_graphs)  # Connect update_graphs to this timer
-        self.update_graphs_timer.start(self.update_graphs_sampling_rate)  # Start with 900 ms interval
+        # Live samples arrive from background workers and are drained once per frame
+        self.live_queue = queue.Queue(maxsize=LIVE_QUEUE_SIZE)
+        self.acquisition_workers = {}
+        self.timer.timeout.connect(self.drain_live_samples)
 
-        # Create a timer for real-time updates
+        # Refresh the acquisition statistics twice a second
         self.real_time_timer = QTimer(self)
-        self.real_time_timer.timeout.connect(self.update_real_time_graphs)
-        self.real_time_timer.timeout.connect(self.connect_to_signal)
-        self.real_time_timer.start(self.real_time_sampling_rate)  # Start with 1000 ms interval
+        self.real_time_timer.timeout.connect(self.update_live_status)
+        self.real_time_timer.start(self.real_time_sampling_rate)  # Start with 500 ms interval
 
         # Create a timer for circular graph updates
         self.circular_graph_timer = QTimer(self)
         self.circular_graph_timer.timeout.connect(self.update_circular_graph)
-        self.circular_graph_timer.start(self.circular_graph_sampling_rate)  # Start with 1300 ms interval
+        self.circular_graph_timer.start(self.circular_graph_sampling_rate)  # Start with 700 ms interval
+        self.profiler.set_interval('update_circular_graph', self.circular_graph_sampling_rate / 1000)
 
 
-        self.signal_data = {
-            'Graph 1': None,
-            'Graph 2': None,
-            'Glued Signals': None,
-            'Graph 3': None
-        }
-        # Create separate timers for each graph
-        self.timers = {
-            'Graph 1': QTimer(self),
-            'Graph 2': QTimer(self),
-            'Glued Signals': QTimer(self),
-            'Graph 3': QTimer(self)
-        }
-        
-        for timer in self.timers.values():
-            timer.timeout.connect(self.update_graphs)
-
-        self.time_index = {
-            'Graph 1': 0,
-            'Graph 2': 0,
-            'Glued Signals': 0,
-            'Graph 3': 0
-        }
-
-        # Store the full plotted data for each graph
-        self.plotted_data = {
-            'Graph 1': ([], []),
-            'Graph 2': ([], []),
-            'Glued Signals': ([], []),
-            'Graph 3': ([], [])
-        }
-        self.time_index = {key: 0 for key in self.signal_data.keys()}
-        self.plotted_data = {key: ([], []) for key in self.signal_data.keys()}
+        # Every channel of every panel, with its own samples, playback position and curve
+        self.signal_store = SignalStore(['Graph 1', 'Graph 2', 'Glued Signals', 'Graph 3'])
 
-        # Initialize graph colors
+        # Initialize graph colors (first channel of each graph; later channels get their own hue)
         self.graph_colors = {
             'Graph 1': 'r',
             'Graph 2': 'g',
@@ -360,7 +2180,61 @@ class MainWindow(QWidget):
         'Glued Signals': False,
         'Graph 3': False
     }
+        # Plot widgets drawn by pyqtgraph (Graph 3 is the custom radar widget)
+        self.plot_widgets = {
+            'Graph 1': self.graph1,
+            'Graph 2': self.graph2,
+            'Glued Signals': self.gluedGraph
+        }
+        self.live_channels = {}  # Channel fed by connect_to_signal, by graph
+        self.graph_filters = {graph_name: 'No filter' for graph_name in self.plot_widgets}  # FILTER_PRESETS names
+        self.filters_attached = set()  # Graphs whose file channels were all given a chain for their preset
+        self.spectrograms = {}  # Spectrogram shown instead of the curves, by graph
+        # ECG channel whose beats drive the radar, its detector and the heart rate series
+        self.heart_rate_signal = None
+        self.heart_rate_detector = None
+        self.heart_rate_store = None
+        self.live_y_ranges = {}
+        self.signal_files = {}  # Open .sig files by path
+        self.loaders = {}  # Background loaders by graph
+        self.export_workers = []  # Snapshots and reports still being written
+        self.growing_signals = {}  # Channels being filled by those loaders
+        # Windows of Graph 1 and Graph 2 glued into the glued graph
+        self.glue_engine = GlueEngine()
+        self.glued_curve = None
+        self.selection_regions = {}  # Window selectors shown while selected mode is on
+        self.real_time_timer.timeout.connect(self.update_memory_status)
+        self.real_time_timer.timeout.connect(self.update_stats_status)
+        self.real_time_timer.timeout.connect(self.update_scrubbers)
+        self.real_time_timer.timeout.connect(self.update_profiler_overlay)
+        # Statistics of the radar data, extended as it grows
+        self.radar_stats = RunningStats()
+        self.radar_stats_count = 0
+        for graph_name, plot_widget in self.plot_widgets.items():
+            plot_widget.sigXRangeChanged.connect(lambda _, __, graph_name=graph_name: self.on_view_range_changed(graph_name))
+
+        self.timer.start(self.timer_interval)
         self.plotComboBox.setCurrentIndex(1)  # Set default to first item
+        mark_startup('window_state')
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if STARTUP_MARKS[-1][0] == 'window_state':
+            mark_startup('first_paint')
+            # Runs once the whole first frame is on screen and the event loop is free
+            QTimer.singleShot(0, self.on_first_frame)
+
+    def on_first_frame(self):
+        mark_startup('first_frame')
+        if '--startup-report' in sys.argv:
+            report = startup_report()
+            report['time'] = datetime.now().isoformat(timespec='seconds')
+            print(json.dumps(report))
+            # Appended so startup times can be followed across versions and machines
+            with open(STARTUP_LOG, 'a') as f:
+                f.write(json.dumps(report) + '\n')
+        if '--quit-after-startup' in sys.argv:
+            QApplication.quit()
 
     def initUI(self):
         # Layout for the entire window
@@ -370,6 +2244,10 @@ class MainWindow(QWidget):
         topLayout = QHBoxLayout()
         openBtn = QPushButton('Open')
         connectBtn = QPushButton('Connect')
+        # Live sources can be logged to captures/ and played back later through replay://file.cap?speed=N|max
+        self.recordCheckBox = QCheckBox('Record')
+        self.recordCheckBox.setToolTip('Log the samples of the next connected source to a capture file')
+        replayBtn = QPushButton('Replay')
         self.signalInput = QLineEdit('Enter address of a realtime signal source')
         self.graph1Radio = QRadioButton('Graph 1')
         self.graph2Radio = QRadioButton('Graph 2')
@@ -385,9 +2263,21 @@ class MainWindow(QWidget):
         plotComboBox.addItem("Glued Signals")
         plotComboBox.addItem("Graph 3")
 
+        self.pollIntervalInput = QSpinBox()
+        self.pollIntervalInput.setRange(10, 60000)
+        self.pollIntervalInput.setSuffix(' ms')
+        self.pollIntervalInput.setValue(DEFAULT_POLL_INTERVAL)
+        self.pollIntervalInput.setToolTip('Poll interval of the real-time source')
+        self.pollIntervalInput.valueChanged.connect(self.update_poll_interval)
+        self.liveStatusLabel = QLabel()
+
         topLayout.addWidget(openBtn)
         topLayout.addWidget(connectBtn)
+        topLayout.addWidget(self.recordCheckBox)
+        topLayout.addWidget(replayBtn)
         topLayout.addWidget(self.signalInput)
+        topLayout.addWidget(self.pollIntervalInput)
+        topLayout.addWidget(self.liveStatusLabel)
         topLayout.addWidget(plotComboBox)
 
         mainLayout.addLayout(topLayout)
@@ -450,7 +2340,6 @@ class MainWindow(QWidget):
         graphLayout.addWidget(self.graph3, 4, 3)
        # graphLayout.addWidget(QScrollBar(Qt.Vertical), 4, 2)  # Scroll for graph 3
         # graphLayout.addWidget(QScrollBar(Qt.Horizontal), 5, 3)  # Scroll for graph 3
-        graphLayout.addWidget(self.graph3_vertical_scroll, 4, 2)
         graphLayout.addWidget(self.graph3_horizontal_scroll, 5, 3)
 
      # Create a new layout for Graph 3 Controls
@@ -495,16 +2384,36 @@ class MainWindow(QWidget):
         plotConcatenatedBtn = QPushButton('Plot Concatenated Signals')
         plotConcatenatedBtn.setFixedWidth(160)  # Set a custom width
 
-        gapInput = QLineEdit()
-        gapInput.setPlaceholderText('gap')
-        gapInput.setFixedWidth(90)  # Set a custom width for the input box
-
-        interpolationInput = QLineEdit()
-        interpolationInput.setPlaceholderText('interpolation')
-        interpolationInput.setFixedWidth(90)  # Set a custom width for the input box
-
-        # Add the new layout next to gluedGraph in the grid
-        graphLayout.addLayout(gluedOptionsLayout, 4, 2)
+        # Seconds between the two windows, negative values overlap them
+        self.gapInput = QDoubleSpinBox()
+        self.gapInput.setRange(-60.0, 60.0)
+        self.gapInput.setDecimals(3)
+        self.gapInput.setSingleStep(0.01)
+        self.gapInput.setSuffix(' s')
+        self.gapInput.setToolTip('gap')
+        self.gapInput.setFixedWidth(90)  # Set a custom width for the input box
+
+        self.interpolationInput = QComboBox()
+        self.interpolationInput.addItems(['linear', 'cubic'])
+        self.interpolationInput.setToolTip('interpolation')
+        self.interpolationInput.setFixedWidth(90)  # Set a custom width for the input box
+
+        gluedOptionsLayout.addWidget(disableSelectedBtn)
+        gluedOptionsLayout.addWidget(plotConcatenatedBtn)
+        gluedOptionsLayout.addWidget(self.gapInput)
+        gluedOptionsLayout.addWidget(self.interpolationInput)
+        gluedOptionsLayout.addStretch()
+
+        disableSelectedBtn.clicked.connect(self.disable_selected_mode)
+        plotConcatenatedBtn.clicked.connect(self.plot_concatenated_signals)
+        self.gapInput.valueChanged.connect(self.update_glue_seam)
+        self.interpolationInput.currentTextChanged.connect(self.update_glue_seam)
+
+        # Add the new layout next to gluedGraph in the grid, sharing the cell with Graph 3's scrollbar
+        gluedSideLayout = QHBoxLayout()
+        gluedSideLayout.addLayout(gluedOptionsLayout)
+        gluedSideLayout.addWidget(self.graph3_vertical_scroll)
+        graphLayout.addLayout(gluedSideLayout, 4, 2)
 
         # Cine Speed Slider
         cineSpeedLayout = QHBoxLayout()
@@ -515,6 +2424,28 @@ class MainWindow(QWidget):
         self.cineSpeedSlider.valueChanged.connect(self.update_timer_interval)  # Connect slider to function
         cineSpeedLayout.addWidget(cineSpeedLabel)
         cineSpeedLayout.addWidget(self.cineSpeedSlider)
+        # Running statistics of the selected graph
+        self.statsLabel = QLabel()
+        cineSpeedLayout.addWidget(self.statsLabel)
+        # Completion notice of snapshots and reports, cleared after a few seconds
+        self.exportLabel = QLabel()
+        self.exportNoticeTimer = QTimer(self)
+        self.exportNoticeTimer.setSingleShot(True)
+        self.exportNoticeTimer.timeout.connect(self.exportLabel.clear)
+        cineSpeedLayout.addWidget(self.exportLabel)
+        # Callback timings, drawn over the graphs while profiling
+        profileBtn = QPushButton('Profile')
+        profileBtn.setCheckable(True)
+        profileBtn.toggled.connect(self.toggle_profiler)
+        exportTraceBtn = QPushButton('Export Trace')
+        exportTraceBtn.clicked.connect(self.export_profile_trace)
+        cineSpeedLayout.addWidget(profileBtn)
+        cineSpeedLayout.addWidget(exportTraceBtn)
+        self.profilerOverlay = QLabel(self)
+        self.profilerOverlay.setStyleSheet("background-color: rgba(0, 0, 0, 170); color: white; "
+                                           "font-family: monospace; padding: 6px;")
+        self.profilerOverlay.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.profilerOverlay.hide()
 
         mainLayout.addLayout(cineSpeedLayout)
 
@@ -539,8 +2470,23 @@ class MainWindow(QWidget):
         snapshotBtn = QPushButton('Snapshot')
         exportReportBtn = QPushButton('Export Report')
 
+        # Filter preset of the selected graph
+        self.filterInput = QComboBox()
+        self.filterInput.addItems(list(FILTER_PRESETS))
+        self.filterInput.setToolTip("Filter applied to the samples of the selected graph as they are played or received")
+
         bottomLayout.addWidget(moveBtn)
         bottomLayout.addWidget(colorBtn)
+        bottomLayout.addWidget(self.filterInput)
+        self.spectrogramBtn = QPushButton('Spectrogram')
+        self.spectrogramBtn.setCheckable(True)
+        self.spectrogramBtn.setToolTip("Show the short-time spectrum of the first channel of the selected graph")
+        bottomLayout.addWidget(self.spectrogramBtn)
+        self.heartRateBtn = QPushButton('Heart Rate')
+        self.heartRateBtn.setCheckable(True)
+        self.heartRateBtn.setToolTip("Detect the R peaks of the first channel of the selected graph "
+                                     "and show the heart rate on Graph 3")
+        bottomLayout.addWidget(self.heartRateBtn)
         bottomLayout.addWidget(self.signalInput)
         bottomLayout.addWidget(snapshotBtn)
         bottomLayout.addWidget(exportReportBtn)
@@ -552,7 +2498,14 @@ class MainWindow(QWidget):
         # Connect buttons
         openBtn.clicked.connect(self.openFile)
         connectBtn.clicked.connect(self.connect_to_signal)  # Connect the connect button to the method
+        replayBtn.clicked.connect(self.replay_capture)
         colorBtn.clicked.connect(self.openColorDialog)
+        self.filterInput.currentTextChanged.connect(
+            lambda preset: self.set_graph_filter(self.plotComboBox.currentText(), preset))
+        self.plotComboBox.currentTextChanged.connect(self.show_graph_controls)
+        self.heartRateBtn.toggled.connect(self.set_heart_rate)
+        self.spectrogramBtn.toggled.connect(
+            lambda enabled: self.set_spectrogram(self.plotComboBox.currentText(), enabled))
         snapshotBtn.clicked.connect(self.take_snapshot)
         exportReportBtn.clicked.connect(self.export_report)
         rewindBtn.clicked.connect(self.rewind)
@@ -569,17 +2522,6 @@ class MainWindow(QWidget):
         self.setWindowTitle('Signal Viewer')
         self.show()
 
-    def graph1_x_scroll_moved(self):
-        """Handle horizontal scrolling for graph1."""
-        current_value = self.graph1_horizontal_scroll.value()
-        difference = current_value - self.prev_graph1_x_scroll
-        
-        if difference != 0:
-            self.update_graph_view(self.graph1, 'x', difference)
-        
-        # Update the previous value to the current value
-        self.prev_graph1_x_scroll = current_value
-
     def graph1_y_scroll_moved(self):
         """Handle vertical scrolling for graph1."""
         current_value = self.graph1_vertical_scroll.value()
@@ -591,15 +2533,6 @@ class MainWindow(QWidget):
         # Update the previous value to the current value
         self.prev_graph1_y_scroll = current_value
 
-    def graph2_x_scroll_moved(self):
-        current_value = self.graph2_horizontal_scroll.value()
-        difference = current_value - self.prev_graph2_x_scroll
-        
-        if difference != 0:
-            self.update_graph_view(self.graph2, 'x', difference)
-        
-        self.prev_graph2_x_scroll = current_value
-
     def graph2_y_scroll_moved(self):
         current_value = self.graph2_vertical_scroll.value()
         difference = current_value - self.prev_graph2_y_scroll
@@ -609,15 +2542,6 @@ class MainWindow(QWidget):
         
         self.prev_graph2_y_scroll = current_value
 
-    def glued_x_scroll_moved(self):
-        current_value = self.glued_horizontal_scroll.value()
-        difference = current_value - self.prev_glued_x_scroll
-        
-        if difference != 0:
-            self.update_graph_view(self.gluedGraph, 'x', difference)
-        
-        self.prev_glued_x_scroll = current_value
-
     def glued_y_scroll_moved(self):
         current_value = self.glued_vertical_scroll.value()
         difference = current_value - self.prev_glued_y_scroll
@@ -684,102 +2608,143 @@ class MainWindow(QWidget):
             if source_graph and destination_graph:
                 self.move_signal(source_graph, destination_graph)  
     def refresh_plot(self, graph_name):
-        # Refresh the plot by replotting data for the given graph
-        if graph_name == 'Graph 1':
-            self.graph1.plot(self.plotted_data['Graph 1'][0], self.plotted_data['Graph 1'][1], clear=True)
-        elif graph_name == 'Graph 2':
-            self.graph2.plot(self.plotted_data['Graph 2'][0], self.plotted_data['Graph 2'][1], clear=True)
-        elif graph_name == 'Glued Signals':
-            self.gluedGraph.plot(self.plotted_data['Glued Signals'][0], self.plotted_data['Glued Signals'][1], clear=True)
-        elif graph_name == 'Graph 3':
-            self.graph3.plot(self.plotted_data['Graph 3'][0], self.plotted_data['Graph 3'][1], clear=True)
-            ########################## move signal with dynamic display but starting from the beginning ################ 
+        # Refresh the plot by redrawing the buffered data of every channel in the given graph
+        for signal in self.signal_store.channels(graph_name):
+            signal.buffer.redraw()
+            ########################## move signal with dynamic display, keeping what was already played ################ 
     def move_signal(self, source, destination): 
         if source != destination and self.is_playing_graph[source]: 
-            # Retrieve the entire signal data from the source
-            signal_data = self.signal_data[source]  # Get the current signal data for the source
-            
-            # Check if there's any signal data to move
-            if signal_data is not None:
-                # Copy the signal data to the destination graph
-                self.signal_data[destination] = signal_data
-
-                # Clear the source data after moving
-                self.signal_data[source] = None  # Clear source graph data
-
-                # Clear the plot on the source graph
-                self.clear_plot(source)
-
-                # Refresh both source and destination plots
-                #self.refresh_plot(source)
-                self.refresh_plot(destination)
-
+            # Channels keep their samples, cursor and curve; only the panel they belong to changes
+            channels = list(self.signal_store.channels(source))
+            if channels and source in self.plot_widgets and destination in self.plot_widgets:
+                for signal in channels:
+                    if self.live_channels.get(source) is signal:
+                        if destination in self.live_channels:
+                            continue  # One live source per graph
+                        # Samples still arriving from the source follow the channel
+                        self.live_channels[destination] = self.live_channels.pop(source)
+                        self.live_y_ranges.pop(source, None)
+                        worker = self.acquisition_workers.pop(source, None)
+                        if worker is not None:
+                            worker.graph_name = destination
+                            self.acquisition_workers[destination] = worker
+                    curve = signal.buffer.curve
+                    self.plot_widgets[source].removeItem(curve)
+                    # Parent the curve to the view box first, or pyqtgraph briefly hands it the
+                    # PlotWidget as its view and clip-to-view fails
+                    curve.setParentItem(self.plot_widgets[destination].plotItem.vb.childGroup)
+                    self.plot_widgets[destination].addItem(curve)
+                    self.signal_store.move(signal, destination)
+                    signal.chain = None  # Filtered with the destination's preset from here
+
+                self.attach_filters(destination)
+                for graph_name in (source, destination):
+                    if graph_name in self.spectrograms:
+                        self.set_spectrogram(graph_name, False)  # Shown again on request, for the new channels
                 # Update playing states
                 self.is_playing_graph[destination] = True  # Start playing on the destination graph
                 self.is_playing_graph[source] = False  # Stop playing on the source graph
 
                 # Plot the updated signal on the destination graph
                 self.plot_signal(destination)
-            
-                
+                self.update_memory_status()
+
                 self.update_graphs()  # Update all graphs
 
     def clear_plot(self, graph_name):
-        # Clear the plot by setting its data to empty lists
-        if graph_name == 'Graph 1':
-            self.graph1.plot([], [], clear=True)  # Clear Graph 1
-        elif graph_name == 'Graph 2':
-            self.graph2.plot([], [], clear=True)  # Clear Graph 2
-        elif graph_name == 'Glued Signals':
-            self.gluedGraph.plot([], [], clear=True)  # Clear Glued Signals
-        elif graph_name == 'Graph 3':
-            self.graph3.plot([], [], clear=True)  # Clear Graph 3
-
-
-
-    
+        # Clear the plot by emptying the buffers of its channels
+        for signal in self.signal_store.channels(graph_name):
+            signal.buffer.reset()
+            signal.buffer.redraw()
+        if graph_name in self.spectrograms:
+            self.spectrograms[graph_name].reset()
+
+    def add_channel(self, graph_name, name, time, amplitude, path=None, column=None):
+        """Create a channel on graph_name around existing arrays (no copy) and give it its own curve."""
+        count = len(self.signal_store.channels(graph_name))
+        # The first channel keeps the graph color, the others get distinct hues
+        color = self.graph_colors[graph_name] if count == 0 else pg.intColor(count, hues=9)
+        signal = Signal(name, path or name, time, amplitude, color, graph_name, column=column)
+        if graph_name in self.plot_widgets:
+            signal.buffer.attach(self.plot_widgets[graph_name], color)
+            self.signal_store.add(signal)
+            self.filters_attached.discard(graph_name)
+        return signal
+
+    def update_memory_status(self):
+        """List the channels of every graph with their memory in the graph's tooltip."""
+        for graph_name, plot_widget in self.plot_widgets.items():
+            lines = []
+            for signal in self.signal_store.channels(graph_name):
+                resident, mapped = signal.memory_usage()
+                line = f"{os.path.basename(signal.name)}: {len(signal)} samples, {format_bytes(resident)}"
+                lines.append(line + (f" + {format_bytes(mapped)} mapped" if mapped else ""))
+            if lines:
+                resident, mapped = self.signal_store.memory_usage(graph_name)
+                lines.append(f"Total: {format_bytes(resident)}" + (f" + {format_bytes(mapped)} mapped" if mapped else ""))
+            plot_widget.setToolTip('\n'.join(lines))
 
     def update_timer_interval(self):
         speed = self.cineSpeedSlider.value()  # Get the current value of the slider
-        self.timer_interval = 1000 / speed  # Calculate the new timer interval
-        self.timer.start(int(self.timer_interval))  # Update the timer with the new interval
+        # The clock keeps ticking at the refresh rate; the slider scales playback (10 = real time)
+        self.playback_speed = speed / 10
 
     def openFile(self):
                 if self.plotComboBox.currentText() == 'Graph 3':
                     # Open a file dialog to browse the PC to select a signal file
                     file_name, _ = QFileDialog.getOpenFileName(self, "Open File", "",
-                                                               "Text Files (*.txt);;All Files (*)")
+                                                               "Text Files (*.txt);;Binary Signals (*.sig);;All Files (*)")
                     if file_name:
-                        self.data = np.loadtxt(file_name)  # Load the data from the file
-                        self.graph3.data = self.data  # Pass the data to the graph widget
-                        self.graph3.angle = 0  # Reset the angle for radar mode
-
-                        # Start displaying the signal in cine mode
-                        self.start_cine_mode()
+                        self.heartRateBtn.setChecked(False)  # The file replaces the heart rate
+                        if file_name.endswith('.sig'):
+                            self.data = np.asarray(SignalFile(file_name).amplitude)
+                            self.reset_radar_stats()
+                            self.graph3.data = self.data  # Pass the data to the graph widget
+                            self.graph3.angle = 0  # Reset the angle for radar mode
+
+                            # Start displaying the signal in cine mode
+                            self.start_cine_mode()
+                        else:
+                            # Parsed in the background, the radar starts on the first chunk
+                            self.start_loading('Graph 3', file_name)
 
                 else :
                     file_name, _ = QFileDialog.getOpenFileName(self, "Open File", "",
-                                                               "CSV Files (*.csv);;All Files (*)")
+                                                               "CSV Files (*.csv);;Binary Signals (*.sig);;All Files (*)")
                     if file_name:
-                        # Load the data from the file
-                        time, selected_signal = self.load_signal_data(file_name)
                         selected_graph = self.plotComboBox.currentText()
+                        if file_name.endswith('.sig'):
+                            # Load the data from the file
+                            time, channels = self.load_signal_data(file_name)
+                            channel_count = channels.shape[1]
+                        else:
+                            channel_count = csv_shape(file_name)[1] - 1
+
+                        # Recorders write several leads per file; each can go to any graph
+                        channel_graphs = {0: selected_graph}
+                        if channel_count > 1:
+                            dialog = ChannelDialog(file_name, channel_count, selected_graph)
+                            if dialog.exec_() != QDialog.Accepted:
+                                return
+                            channel_graphs = dialog.get_channel_graphs()
+                        if not channel_graphs or selected_graph not in self.plot_widgets:
+                            return
+
+                        if not file_name.endswith('.sig'):
+                            # CSV files are parsed in the background and start playing on the first chunk
+                            self.start_loading(selected_graph, file_name, channel_graphs)
+                            return
+
+                        # Every selected column becomes a channel next to those already in its graph,
+                        # as a view of the mapped file
+                        for column, graph_name in channel_graphs.items():
+                            signal = self.add_channel(graph_name, self.channel_name(file_name, column, channel_count),
+                                                      time, channels[:, column], path=file_name, column=column)
+                            # Memory-mapped files bring their own block index
+                            signal.pyramid = self.signal_files[file_name].pyramid(column)
+                            self.is_playing_graph[graph_name] = True
+                        self.update_memory_status()
 
-                        # Store the loaded signal in the corresponding graph's entry
-                        if selected_graph in self.signal_data:
-                            # Check if the current signal is already loaded; If not, initialize it
-                            if self.signal_data[selected_graph] is None:
-                                self.signal_data[selected_graph] = (time, selected_signal)
-                                self.time_index[selected_graph] = 0
-
-                            else:
-                                # Append new data to existing data
-                                existing_time, existing_signal = self.signal_data[selected_graph]
-                                self.signal_data[selected_graph] = (np.concatenate((existing_time, time)),
-                                                                    np.concatenate((existing_signal, selected_signal)))
-
-                        # Clear previously plotted data for the selected graph
-                        self.plotted_data[selected_graph] = ([], [])
                         # Update the graph with the newly loaded signal
                         self.update_graphs()
                         # Set the graph to play after loading
@@ -787,338 +2752,942 @@ class MainWindow(QWidget):
                         self.playPauseBtn.setText('Pause') 
                         self.toggle_play_pause()
 
+    def channel_name(self, file_name, column, channel_count):
+        return file_name if channel_count == 1 else f"{file_name} [{column + 1}]"
+
+    def start_loading(self, graph_name, file_name, channel_graphs=None):
+        """Parse file_name in chunks on a worker thread, feeding new channels as chunks arrive.
+
+        channel_graphs maps the column index of every channel to load to its graph (default: the first one to graph_name).
+        """
+        # Radar data replaces the previous load, files on the plots are loaded side by side
+        key = graph_name if graph_name == 'Graph 3' else file_name
+        previous_loader = self.loaders.pop(key, None)
+        if previous_loader is not None:
+            previous_loader.requestInterruption()
+
+        if graph_name == 'Graph 3':
+            signal = self.add_channel(graph_name, file_name, np.empty(0), np.empty(0))
+            signal.store = GrowableSignal()
+            self.graph3.data = None
+            self.graph3.angle = 0  # Reset the angle for radar mode
+            self.reset_radar_stats()
+            self.growing_signals[key] = [signal]
+        else:
+            # All channels share one time column and one (n_samples, n_channels) matrix, sized from the file
+            estimated_rows, column_count = csv_shape(file_name)
+            store = GrowableSignal(max(int(1.1 * estimated_rows), GROWABLE_INITIAL_CAPACITY),
+                                   channels=column_count - 1, dtype=CHANNEL_DTYPE)
+            channels = []
+            for column, channel_graph in (channel_graphs or {0: graph_name}).items():
+                signal = self.add_channel(channel_graph, self.channel_name(file_name, column, column_count - 1),
+                                          np.empty(0), np.empty(0), path=file_name, column=column)
+                signal.store = store
+                channels.append(signal)
+            self.growing_signals[key] = channels
+
+        # Parented to the window so a cancelled loader outlives our reference until its thread ends
+        loader = SignalLoader(key, file_name, text_file=(graph_name == 'Graph 3'), parent=self)
+        loader.finished.connect(loader.deleteLater)
+        progress_dialog = QProgressDialog(f"Loading {os.path.basename(file_name)}...", "Cancel", 0, 100, self)
+        progress_dialog.setWindowModality(Qt.NonModal)
+        progress_dialog.setMinimumDuration(300)  # Small files load without flashing a dialog
+        progress_dialog.canceled.connect(loader.requestInterruption)
+        loader.progress.connect(progress_dialog.setValue)
+        loader.loading_done.connect(progress_dialog.reset)
+        loader.chunk_loaded.connect(self.on_chunk_loaded)
+        loader.loading_done.connect(self.on_loading_done)
+        loader.failed.connect(lambda message: QMessageBox.warning(self, "Open File", message))
+        self.loaders[key] = loader
+        loader.start()
+
+    def on_chunk_loaded(self, key, times, amplitudes):
+        if self.loaders.get(key) is not self.sender():
+            return  # Chunk from a cancelled or replaced load
+        channels = self.growing_signals[key]
+        store = channels[0].store
+        first_chunk = store.size == 0
+        reallocated = store.extend(times, amplitudes)
+
+        if key == 'Graph 3':
+            self.data = store.amplitude[:store.size]
+            self.graph3.data = self.data  # Pass the data to the graph widget
+            if first_chunk:
+                self.start_cine_mode()  # Start displaying the signal in cine mode
+            return
+
+        for signal in channels:
+            signal.set_data(*store.view(signal.column))
+            if reallocated or signal.pyramid is None:
+                signal.pyramid = MinMaxPyramid(store.time, store.amplitude[:, signal.column], valid_samples=store.size)
+            else:
+                signal.pyramid.update(store.size)  # Only the new blocks are summarised
+
+            if first_chunk:
+                signal.sample_rate = estimate_sample_rate(signal.time)
+                signal.chain = None  # Its sections depend on the sampling rate
+                self.filters_attached.discard(signal.graph)
+                # Playback starts while the rest of the file is still being parsed
+                self.is_playing_graph[signal.graph] = True
+                if self.plotComboBox.currentText() == signal.graph:
+                    self.playPauseBtn.setText('Pause')
+
+    def on_loading_done(self, key, completed):
+        if self.loaders.get(key) is self.sender():
+            del self.loaders[key]
+            for signal in self.growing_signals.pop(key, []):
+                signal.store = None  # The arrays stay, the channels just stop growing
+            self.update_memory_status()
 
     def load_signal_data(self, file_name):
         if self.plotComboBox.currentText() != 'Graph 3':
-            """Load ECG data from a CSV file."""
-            data = pd.read_csv(file_name, header=None)
-            time = data[0].to_numpy()
-            amplitude = data[1].to_numpy()
-            return time, amplitude
+            """Load a recording as its time column and an (n_samples, n_channels) amplitude matrix.
+
+            CSV files are parsed once into a single column-major matrix; .sig files are mapped, not read.
+            """
+            if file_name.endswith('.sig'):
+                signal_file = SignalFile(file_name)
+                self.signal_files[file_name] = signal_file
+                return signal_file.time, signal_file.channels.T
+            return read_csv_channels(file_name)
 
     def connect_to_signal(self):
         url = self.signalInput.text().strip()  # Get URL from input field and trim whitespace
 
-        if not url or not (url.startswith("http://") or url.startswith("https://")):
+        if not url or not url.startswith(("http://", "https://", "tcp://", "udp://", "replay://")):
             return  # Do nothing if URL is invalid or empty
 
+        selected_graph = self.plotComboBox.currentText()  # Get the selected graph from the combo box
+        if selected_graph not in self.plot_widgets:
+            return
+        previous_worker = self.acquisition_workers.pop(selected_graph, None)
+        if previous_worker is not None:
+            previous_worker.stop()
+            if isinstance(previous_worker, SocketIngestWorker):
+                # It holds its port until its next timeout; binding the same address again before fails
+                previous_worker.wait()
+
+        if selected_graph not in self.live_channels:
+            # Live samples get a channel of their own next to any loaded files
+            signal = self.add_channel(selected_graph, url, np.empty(0), np.empty(0))
+            signal.store = GrowableSignal()
+            signal.tracker = RangeTracker()
+            self.live_channels[selected_graph] = signal
+
+        # Sources run on a worker thread so a slow source can't freeze the plots
+        if url.startswith(("tcp://", "udp://")):
+            try:
+                worker = SocketIngestWorker(selected_graph, url, self.live_queue, parent=self)
+            except ValueError as e:
+                QMessageBox.warning(self, "Connect", f"Invalid address {url}: {e}")
+                return
+        elif url.startswith("replay://"):
+            # A recorded session goes through the same queue as the source it was captured from
+            try:
+                worker = ReplayWorker(selected_graph, url, self.live_queue, parent=self)
+            except (OSError, ValueError) as e:
+                QMessageBox.warning(self, "Connect", f"Cannot replay {url}: {e}")
+                return
+        else:
+            worker = AcquisitionWorker(selected_graph, url, self.live_queue, self.pollIntervalInput.value(), parent=self)
+        if self.recordCheckBox.isChecked():
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            capture_path = os.path.join(CAPTURE_DIR, f"capture_{selected_graph.replace(' ', '_').lower()}_{timestamp}.cap")
+            try:
+                worker.capture = CaptureWriter(capture_path, url)
+            except OSError as e:
+                QMessageBox.warning(self, "Record", f"Cannot write {capture_path}: {e}")
+        worker.finished.connect(lambda worker=worker: self.on_worker_finished(worker))
+        self.acquisition_workers[selected_graph] = worker
+        worker.start()
+
+    def replay_capture(self):
+        file_name, _ = QFileDialog.getOpenFileName(self, "Replay Capture", CAPTURE_DIR, "Capture Logs (*.cap);;All Files (*)")
+        if file_name:
+            self.signalInput.setText(f"replay://{file_name}")
+            self.connect_to_signal()
+
+    def on_worker_finished(self, worker):
+        # Replays end on their own; forget the worker before Qt deletes it
+        for graph_name, running in list(self.acquisition_workers.items()):
+            if running is worker:
+                del self.acquisition_workers[graph_name]
+        worker.deleteLater()
+
+    def update_poll_interval(self, interval):
+        for worker in self.acquisition_workers.values():
+            worker.poll_interval = interval / 1000
+
+    def drain_live_samples(self):
+        """Move every queued live sample into its graph, then redraw the live graphs once."""
+        samples = []
         try:
-            response = requests.get(url)  # Send a request to the API
-            response.raise_for_status()  # Raise an error for bad responses
-            data = response.json()  # Parse JSON response
-
-            # Check for 'price' in the response
-            if 'price' in data:
-                price = float(data['price'])  # Extract price as a float
-
-                current_time = time.time()  # Get the current time for plotting
-                selected_graph = self.plotComboBox.currentText()  # Get the selected graph from the combo box
-                if self.signal_data[selected_graph] is None:
-                    self.signal_data[selected_graph] = ([], [])  # Initialize if None
-
-                # Append the new data to your signal data
-                self.signal_data[selected_graph][0].append(current_time)  # Time data
-                self.signal_data[selected_graph][1].append(price)  # Price data
-
-                print(f"Current Price: {price}")  # For debugging
-
-                # Update the graphs after adding new data
-                self.update_real_time_graphs()  # Update graphs with new data
+            while True:
+                samples.append(self.live_queue.get_nowait())
+        except queue.Empty:
+            pass
+        if not samples:
+            return
+
+        for graph_name in {sample[0] for sample in samples}:
+            signal = self.live_channels.get(graph_name)
+            if signal is None:
+                continue  # The source was disconnected meanwhile
+            times = np.concatenate([sample[1] for sample in samples if sample[0] == graph_name])
+            values = np.concatenate([sample[2] for sample in samples if sample[0] == graph_name])
+            if signal.chain is None:
+                self.attach_live_filter(signal, times)
+            # Append the new data to the live channel; the graph shows it filtered
+            signal.store.extend(times, values)
+            signal.set_data(*signal.store.view())
+            if signal.chain is not None:
+                values = signal.chain.process(values)
+            signal.tracker.extend(times, values)
+            signal.buffer.extend(times, values)
+            signal.stats.extend(values)
+            self.feed_analysis(signal, times, values)
+            if self.profiler.enabled:
+                self.profiler.count_samples(graph_name, len(values))
+
+        # Update the graphs after adding new data
+        self.update_real_time_graphs()
+
+    def reset_radar_stats(self):
+        self.radar_stats = RunningStats()
+        self.radar_stats_count = 0
+
+    def panel_stats(self, graph_name):
+        """Running statistics of everything played or received on a graph, merged over its channels."""
+        stats = RunningStats()
+        for signal in self.signal_store.channels(graph_name):
+            stats.merge(signal.stats)
+        if graph_name == 'Glued Signals' and self.glue_engine.head is not None:
+            stats.merge(self.glue_engine.stats())
+        if graph_name == 'Graph 3' and self.graph3.data is not None:
+            # Only the part of the radar data not seen yet is summarised
+            self.radar_stats.extend(self.graph3.data[self.radar_stats_count:])
+            self.radar_stats_count = len(self.graph3.data)
+            stats.merge(self.radar_stats)
+        return stats
+
+    def update_stats_status(self):
+        selected_graph = self.plotComboBox.currentText()
+        if selected_graph not in self.is_playing_graph:
+            return
+        stats = self.panel_stats(selected_graph)
+        if not stats.count:
+            self.statsLabel.clear()
+            return
+        self.statsLabel.setText(', '.join(f"{name} {value:.5f}" for name, value in stats.summary())
+                                + f" ({stats.count} samples)")
+
+    def update_live_status(self):
+        """Show round-trip latency and dropped samples of the real-time sources."""
+        parts = []
+        for graph_name, worker in self.acquisition_workers.items():
+            latency = '-' if worker.latency is None else f"{1000 * worker.latency:.0f} ms"
+            parts.append(f"{graph_name}: {latency}, received {worker.received}, dropped {worker.dropped}")
+        self.liveStatusLabel.setText(' | '.join(parts))
+
+    def toggle_profiler(self, enabled):
+        self.profiler.reset()
+        for worker in self.acquisition_workers.values():
+            if isinstance(worker, AcquisitionWorker):
+                worker.polls.clear()  # Polls from before the profiler was on aren't counted
+        self.profiler.enabled = enabled
+        self.profilerOverlay.setVisible(enabled)
+        self.update_profiler_overlay()
+
+    def update_profiler_overlay(self):
+        if not self.profiler.enabled:
+            return
+        self.record_poll_latencies()
+        self.profiler.update_rates()
+        self.profilerOverlay.setText(self.profiler.overlay_text())
+        self.profilerOverlay.adjustSize()
+        # Top right corner, above the graphs
+        self.profilerOverlay.move(self.width() - self.profilerOverlay.width() - 10, 40)
+        self.profilerOverlay.raise_()
+
+    def record_poll_latencies(self):
+        """Hand the round trip of every HTTP poll since the last call to the profiler, one entry per source."""
+        for graph_name, worker in self.acquisition_workers.items():
+            if not isinstance(worker, AcquisitionWorker):
+                continue  # Sockets and replays receive without polling
+            name = f'poll {graph_name}'
+            self.profiler.set_interval(name, worker.poll_interval)  # Polls coming later than this are late
+            while worker.polls:
+                self.profiler.record(name, *worker.polls.popleft())
+
+    def export_profile_trace(self):
+        file_name, _ = QFileDialog.getSaveFileName(self, "Export Trace", "profile_trace.csv",
+                                                   "CSV Files (*.csv);;JSON Files (*.json)")
+        if not file_name:
+            return
+        try:
+            self.profiler.export(file_name)
+        except OSError as e:
+            self.show_export_notice(f"Could not write {file_name}: {e}")
+            return
+        self.show_export_notice(f"Trace saved to {file_name}")
+
+    def closeEvent(self, event):
+        # Let the worker threads finish before the window goes away
+        for worker in self.acquisition_workers.values():
+            worker.stop()
+            worker.wait()
+        for loader in self.loaders.values():
+            loader.requestInterruption()
+            loader.wait()
+        # Don't leave half-written snapshots or reports behind
+        for worker in self.export_workers:
+            worker.wait()
+        super().closeEvent(event)
+
+    @profiled
+    def update_graphs(self):
+        """Advance every playing graph by the wall-clock time since the last frame."""
+        now = time.perf_counter()
+        elapsed = 0.0 if self.last_frame_time is None else now - self.last_frame_time
+        self.last_frame_time = now
+        # Don't jump ahead after the event loop was blocked (dialogs, window drags...)
+        elapsed = min(elapsed, MAX_FRAME_STEP)
+
+        # The clock of a link group moves once per frame, however many graphs it has
+        for group in {id(group): group for group in self.link_groups.values()}.values():
+            if self.is_playing_graph[group.members[0]]:
+                group.position += elapsed * self.playback_speed
+
+        for graph_name, channels in self.signal_store.panels.items():
+            if graph_name not in self.plot_widgets or not self.is_playing_graph[graph_name]:
+                continue
+            group = self.link_groups.get(graph_name)
+            if graph_name not in self.filters_attached:
+                self.attach_filters(graph_name)  # Channels opened here since the preset was chosen
+            advanced = []
+            for signal in channels:
+                if signal.tracker is not None:
+                    continue  # Live channels are refreshed by update_real_time_graphs
+                current_index = signal.last_index
+                if current_index >= len(signal):
+                    continue
+
+                if group is None:
+                    # Move the cursor by this channel's own sampling rate, possibly several samples per frame
+                    signal.cursor += elapsed * signal.sample_rate * self.playback_speed
+                    new_index = min(int(signal.cursor), len(signal))
+                    if new_index <= current_index:
+                        continue  # Slower than one sample per frame: wait until the cursor reaches the next one
+                else:
+                    # Linked channels play up to the group's instant, whatever their sampling rate
+                    new_index = int(np.searchsorted(signal.time, signal.time[0] + group.position, side='right'))
+                    if new_index <= current_index:
+                        continue
+                    signal.cursor = float(new_index)
+
+                advanced.append((signal, current_index, new_index))
+            if advanced:
+                self.play_samples(advanced)
+                self.plot_signal(graph_name)  # One redraw per graph per frame
+                if self.profiler.enabled:
+                    self.profiler.count_samples(graph_name, sum(stop - start for _, start, stop in advanced))
+
+    @profiled
+    def update_real_time_graphs(self):
+        """Update the graphs fed by a real-time source."""
+        for graph_name, signal in self.live_channels.items():
+            if not len(signal):
+                continue  # Connected, but nothing received yet
+            plot_widget = self.plot_widgets[graph_name]
 
-            else:
-                print("Error: 'price' key not found in the response.")
+            # Set y-axis limits from the signal range over the trailing window, tracked as samples arrive
+            min_signal, max_signal = signal.tracker.window_range()
 
-        except requests.exceptions.RequestException as e:
-            print(f"Error connecting to signal: {e}")
-        except ValueError as e:
-            print(f"Error parsing JSON: {e}")
+            padding = 0.1  # Adjust this value as needed for better visibility
+            y_range = (min_signal - padding, max_signal + padding)
+            if graph_name not in self.spectrograms and y_range != self.live_y_ranges.get(graph_name):
+                plot_widget.setYRange(*y_range)  # Set y-axis limits
+                self.live_y_ranges[graph_name] = y_range
 
-    def update_graphs(self):
-        """Update all graphs with their respective ECG data."""
-        for graph_name in self.signal_data.keys():
-              if self.signal_data[graph_name] is not None and self.is_playing_graph[graph_name]:
-                time, signal = self.signal_data[graph_name]  # Unpack the tuple
-                current_index = self.time_index[graph_name]
-          
-                if current_index < len(signal):
-                # Append the new data point for plotting
-                 self.plotted_data[graph_name][0].append(time[current_index])
-                 self.plotted_data[graph_name][1].append(signal[current_index])
-
-                # Plot the full line so far
-                self.plot_signal(graph_name)
-                self.time_index[graph_name] += 1  # Increment time index for this graph
+            self.plot_signal(graph_name)
 
-    def update_real_time_graphs(self):
-        """Update all graphs with their respective ECG data."""
-        for graph_name in self.signal_data.keys():
-            if self.signal_data[graph_name] is not None:
-                time, signal = self.signal_data[graph_name]  # Unpack the tuple
-                
-                # Clear the existing plot and plot new data
-                if graph_name == 'Graph 1':
-                    self.graph1.clear()
-                    
-                    # Set y-axis limits based on signal range
-                    min_signal = min(signal)  # Find the minimum value in the signal
-                    max_signal = max(signal)  # Find the maximum value in the signal
-                    
-                    padding = 0.1  # Adjust this value as needed for better visibility
-                    self.graph1.setYRange(min_signal - padding, max_signal + padding)  # Set y-axis limits
-                    
-                    self.graph1.plot(time, signal, pen='r')  # Use a white pen for better visibility
-
-                elif graph_name == 'Graph 2':
-                    self.graph2.clear()
-                    
-                    min_signal = min(signal)
-                    max_signal = max(signal)
-                    
-                    padding = 0.1
-                    self.graph2.setYRange(min_signal - padding, max_signal + padding)
-                    
-                    self.graph2.plot(time, signal, pen='r')
-
-                elif graph_name == 'Glued Signals':
-                    self.gluedGraph.clear()
-                    
-                    min_signal = min(signal)
-                    max_signal = max(signal)
-                    
-                    padding = 0.1
-                    self.gluedGraph.setYRange(min_signal - padding, max_signal + padding)
-                    
-                    self.gluedGraph.plot(time, signal, pen='r')
-
-                elif graph_name == 'Graph 3':
-                    self.graph3.clear()
-                    
-                    min_signal = min(signal)
-                    max_signal = max(signal)
-                    
-                    padding = 0.1
-                    self.graph3.setYRange(min_signal - padding, max_signal + padding)
-                    
-                    self.graph3.plot(time, signal, pen='r')
-
-                
     def plot_signal(self, graph_name):
-        """Plot the signal on the appropriate graph."""
-        if self.hidden_signals[graph_name]:
-            # If the signal is hidden, clear the graph and return
-            if graph_name == "Graph 1":
-                self.graph1.clear()
-            elif graph_name == "Graph 2":
-                self.graph2.clear()
-            elif graph_name == "Glued Signals":
-                self.gluedGraph.clear()
-        
-            return  # Don't plot anything if hidden
-
-        color = self.graph_colors[graph_name]  # Get the current color for the graph
-        if graph_name == "Graph 1":
-            self.graph1.clear()
-            self.graph1.plot(self.plotted_data[graph_name][0], self.plotted_data[graph_name][1], pen=color)
-        elif graph_name == "Graph 2":
-            self.graph2.clear()
-            self.graph2.plot(self.plotted_data[graph_name][0], self.plotted_data[graph_name][1], pen=color)
-        elif graph_name == "Glued Signals":
-            self.gluedGraph.clear()
-            self.gluedGraph.plot(self.plotted_data[graph_name][0], self.plotted_data[graph_name][1], pen=color)
-        elif graph_name == "Graph 3":
-            self.graph3.clear()
-            self.graph3.plot(self.plotted_data[graph_name][0], self.plotted_data[graph_name][1], pen=color)
+        """Plot every channel of the graph."""
+        plot_widget = self.plot_widgets.get(graph_name)
+        if plot_widget is None:
+            return  # Graph 3 draws itself
+
+        view_box = plot_widget.plotItem.vb
+        max_points = 2 * max(int(view_box.width()), 1)  # Two points per pixel column
+        if graph_name == 'Glued Signals' and self.glued_curve is not None:
+            self.glued_curve.setVisible(not self.hidden_signals[graph_name])
+        for signal in self.signal_store.channels(graph_name):
+            buffer = signal.buffer
+            # Hidden signals keep their data, only the curve is hidden
+            visible = signal.show and not self.hidden_signals[graph_name] and graph_name not in self.spectrograms
+            buffer.curve.setVisible(visible)
+            if not visible:
+                continue  # Don't plot anything if hidden
+
+            buffer.set_pen(signal.color)
+            if signal.pyramid is None or signal.tracker is not None:
+                buffer.redraw()
+                continue
+
+            # Draw the played part of the file at the detail the widget can actually show
+            start, stop = self.get_visible_indices(signal)
+            pyramid = signal.pyramid if signal.filtered_pyramid is None else signal.filtered_pyramid
+            buffer.curve.setData(*pyramid.decimate(start, stop, max_points))
+
+        if self.profiler.enabled:
+            curves = [signal.buffer.curve for signal in self.signal_store.channels(graph_name)]
+            if graph_name == 'Glued Signals' and self.glued_curve is not None:
+                curves.append(self.glued_curve)
+            self.profiler.points[graph_name] = sum(len(curve.xData) for curve in curves
+                                                   if curve.isVisible() and curve.xData is not None)
+
+    def get_visible_indices(self, signal):
+        """Sample range of the played part of a channel that falls inside the current view."""
+        played = signal.last_index
+        view_box = self.plot_widgets[signal.graph].plotItem.vb
+        if view_box.autoRangeEnabled()[0]:
+            return 0, played  # Auto-range follows whatever is drawn
+        x_min, x_max = view_box.viewRange()[0]
+        start = max(int(np.searchsorted(signal.time, x_min)) - 1, 0)
+        stop = min(int(np.searchsorted(signal.time, x_max)) + 1, played)
+        return start, max(start, stop)
+
+    def on_view_range_changed(self, graph_name):
+        group = self.link_groups.get(graph_name)
+        if group is not None and not self.syncing_views:
+            self.push_group_view(group, graph_name)
+        # Zooming or panning changes how much detail is needed
+        if graph_name == 'Glued Signals' and self.glue_engine.head is not None:
+            self.plot_glued()
+        if not any(signal.pyramid is not None for signal in self.signal_store.channels(graph_name)):
+            return
+        if not self.plot_widgets[graph_name].plotItem.vb.autoRangeEnabled()[0]:
+            self.plot_signal(graph_name)
+
+    def plot_concatenated_signals(self):
+        """Glue the selected window of Graph 1 to the selected window of Graph 2."""
+        for graph_name in ('Graph 1', 'Graph 2'):
+            if not any(len(signal) > 1 for signal in self.signal_store.channels(graph_name)):
+                QMessageBox.warning(self, "Plot Concatenated Signals", f"Load a signal into {graph_name} first.")
+                return
+            if graph_name not in self.selection_regions:
+                # Selected mode: a draggable window on each graph, starting on what is on screen
+                low, high = self.get_current_view(graph_name)
+                min_bound, max_bound = self.get_signal_bounds(graph_name)
+                region = pg.LinearRegionItem(values=(max(low, min_bound), min(high, max_bound)))
+                region.sigRegionChangeFinished.connect(self.update_glue_windows)
+                self.plot_widgets[graph_name].addItem(region)
+                self.selection_regions[graph_name] = region
+        self.update_glue_windows()
+        self.gluedGraph.enableAutoRange()
+
+    def disable_selected_mode(self):
+        # The glued signal stays, only the window selectors go away
+        for graph_name, region in self.selection_regions.items():
+            self.plot_widgets[graph_name].removeItem(region)
+        self.selection_regions = {}
+
+    def glue_window(self, graph_name):
+        """(pyramid, start, stop) of the first channel of graph_name inside its selection."""
+        signal = next(signal for signal in self.signal_store.channels(graph_name) if len(signal) > 1)
+        pyramid = signal.pyramid
+        if pyramid is None or signal.tracker is not None:
+            pyramid = MinMaxPyramid(signal.time, signal.amplitude)  # Live data has no summary yet
+        low, high = self.selection_regions[graph_name].getRegion()
+        start = int(np.searchsorted(signal.time, low))
+        stop = int(np.searchsorted(signal.time, high, side='right'))
+        # Keep at least two samples so the seam has something to join
+        start = min(start, len(signal) - 2)
+        return pyramid, start, max(stop, start + 2)
+
+    def update_glue_windows(self):
+        if len(self.selection_regions) < 2:
+            return
+        self.glue_engine.gap = self.gapInput.value()
+        self.glue_engine.method = self.interpolationInput.currentText()
+        self.glue_engine.set_windows(self.glue_window('Graph 1'), self.glue_window('Graph 2'))
+        self.plot_glued()
+
+    def update_glue_seam(self):
+        # Only the seam depends on the gap and the interpolation
+        if self.glue_engine.head is not None:
+            self.glue_engine.set_gap(self.gapInput.value(), self.interpolationInput.currentText())
+            self.plot_glued()
+
+    def plot_glued(self):
+        if self.glued_curve is None:
+            self.glued_curve = self.gluedGraph.plot(pen=self.graph_colors['Glued Signals'])
+        self.glued_curve.setVisible(not self.hidden_signals['Glued Signals'])
+        self.glued_curve.setPen(self.graph_colors['Glued Signals'])
+        view_box = self.gluedGraph.plotItem.vb
+        x_min, x_max = (-np.inf, np.inf) if view_box.autoRangeEnabled()[0] else view_box.viewRange()[0]
+        self.glued_curve.setData(*self.glue_engine.decimate(x_min, x_max, 2 * max(int(view_box.width()), 1)))
+
+    def linked_graphs(self, graph_name):
+        """The graph and every graph linked to it."""
+        group = self.link_groups.get(graph_name)
+        return group.members if group is not None else [graph_name]
 
     def toggle_signal_visibility(self):
-        """Toggle the visibility of the selected graph's signal."""
+        """Toggle the visibility of the selected graph's signal, and of the graphs linked to it."""
         selected_graph = self.plotComboBox.currentText()
-         #######linking 
-        if self.linked==True &((selected_graph=="Graph 1")or(selected_graph=="Graph 2")):
-         if self.is_playing_graph["Graph 1"] and self.is_playing_graph["Graph 2"]:
-            if "Graph 1" in self.hidden_signals or "Graph 2" in self.hidden_signals:
-                self.hidden_signals["Graph 1"] = not self.hidden_signals["Graph 1"]
-                self.hidden_signals["Graph 2"] = not self.hidden_signals["Graph 2"]
-                self.update_graphs() 
-        #if selected_graph in self.hidden_signals:
-        else:        
-         if selected_graph in self.hidden_signals:
-            self.hidden_signals[selected_graph] = not self.hidden_signals[selected_graph]
-        self.update_graphs()  # Refresh the graph to apply visibility changes
-       
+        if selected_graph not in self.hidden_signals:
+            return
+        hidden = not self.hidden_signals[selected_graph]
+        for graph_name in self.linked_graphs(selected_graph):
+            self.hidden_signals[graph_name] = hidden
+            self.plot_signal(graph_name)  # Paused graphs too
+
+    def rewind_graph(self, graph_name):
+        """Send every file channel of a graph back to its first sample."""
+        spectrogram = self.spectrograms.get(graph_name)
+        if spectrogram is not None and spectrogram.signal.tracker is None:
+            spectrogram.reset()
+        for signal in self.signal_store.channels(graph_name):
+            if signal is self.heart_rate_signal and signal.tracker is None:
+                self.restart_heart_rate(signal)  # Beats are found again as the ECG replays
+            if signal.tracker is None:
+                signal.last_index = 0
+                signal.cursor = 0.0
+                # Empty the buffer, keeping its memory for the replay
+                signal.buffer.reset()
+                signal.stats = RunningStats()  # The replay is counted again
+                if signal.chain is not None:
+                    signal.chain.reset([signal.chain_column])  # And filtered from a fresh state
+                if signal.filtered_pyramid is not None:
+                    signal.filtered_pyramid = MinMaxPyramid(signal.filtered_pyramid.time, signal.filtered,
+                                                            valid_samples=0)
+        self.plot_signal(graph_name)  # Refresh the graph
 
     def rewind(self):
-      """Rewind the selected graph to the beginning."""
-      selected_graph = self.plotComboBox.currentText()
-      if selected_graph in self.signal_data:
-        # Reset time index for the selected graph
-        self.time_index[selected_graph] = 0
-        # Clear the plotted data
-        self.plotted_data[selected_graph] = ([], [])
-        # Clear the graph
-        self.plot_signal(selected_graph)  # Refresh the graph  
-         ################### linking working ################
-      if self.linked==True &((selected_graph=="Graph 1")or(selected_graph=="Graph 2")):
-         if self.is_playing_graph["Graph 1"] and self.is_playing_graph["Graph 2"]:
-            self.time_index["Graph 1"] = 0
-            self.time_index["Graph 2"] = 0
-            self.plotted_data["Graph 1"] = ([], [])
-            self.plotted_data["Graph 2"] = ([], [])
-            self.plot_signal("Graph 1")
-            self.plot_signal("Graph 2")
+        """Rewind the selected graph, and the graphs linked to it, to the beginning."""
+        selected_graph = self.plotComboBox.currentText()
+        if selected_graph not in self.plot_widgets:
+            return
+        group = self.link_groups.get(selected_graph)
+        if group is not None:
+            group.position = 0.0
+        for graph_name in self.linked_graphs(selected_graph):
+            self.rewind_graph(graph_name)
+
+    def resume_graph(self, graph_name):
+        # Resume from the last drawn sample; the shared clock does the rest
+        for signal in self.signal_store.channels(graph_name):
+            signal.cursor = float(signal.last_index)
 
     def toggle_play_pause(self):
-     """Toggle between play and pause."""
-     selected_graph = self.plotComboBox.currentText()
-
-     # Toggle the selected graph's play/pause state
-     if selected_graph in self.is_playing_graph:
-        self.is_playing_graph[selected_graph] = not self.is_playing_graph[selected_graph]
-
-        if self.is_playing_graph[selected_graph]:
-            # Start the timer for the selected graph
-            self.timers[selected_graph].start(int(self.timer_interval))
-            self.playPauseBtn.setText('Pause')
-        else:
-            # Stop the timer for the selected graph
-            self.timers[selected_graph].stop()
-            self.playPauseBtn.setText('Play')
-
-      # Handle linking for Graph 1 and Graph 2
-     if self.linked and (selected_graph == "Graph 1" or selected_graph == "Graph 2"):
-        graph1_playing = self.is_playing_graph["Graph 1"]
-        graph2_playing = self.is_playing_graph["Graph 2"]
-
-        # If either graph is playing, stop both
-        if graph1_playing or graph2_playing:
-            self.is_playing_graph["Graph 1"] = False
-            self.is_playing_graph["Graph 2"] = False
-            self.timers["Graph 1"].stop()
-            self.timers["Graph 2"].stop()
-            self.playPauseBtn.setText('Play')
-        else:
-            # If both are paused, start both
-            self.is_playing_graph["Graph 1"] = True
-            self.is_playing_graph["Graph 2"] = True
-            self.timers["Graph 1"].start(int(self.timer_interval))
-            self.timers["Graph 2"].start(int(self.timer_interval))
-            self.playPauseBtn.setText('Pause')
+        """Toggle between play and pause; linked graphs play and pause together."""
+        selected_graph = self.plotComboBox.currentText()
+        if selected_graph not in self.is_playing_graph:
+            return
+        playing = not self.is_playing_graph[selected_graph]
+        for graph_name in self.linked_graphs(selected_graph):
+            self.is_playing_graph[graph_name] = playing
+            if playing:
+                self.resume_graph(graph_name)
+        self.playPauseBtn.setText('Pause' if playing else 'Play')
 
-    
     def zoom_in(self):
-      selected_graph = self.plotComboBox.currentText()
-      if selected_graph in self.signal_data and self.signal_data[selected_graph] is not None:
-        current_view = self.get_current_view(selected_graph)
-        new_range = (
-            max(current_view[0] + (current_view[1] - current_view[0]) * 0.25, self.get_signal_bounds(selected_graph)[0]),
-            min(current_view[1] - (current_view[1] - current_view[0]) * 0.25, self.get_signal_bounds(selected_graph)[1])
-        )
-        self.set_view_range(selected_graph, new_range)
-       ############### Linking working #############
-      if self.linked==True &((selected_graph=="Graph 1")or(selected_graph=="Graph 2")):
-         if self.is_playing_graph["Graph 1"] and self.is_playing_graph["Graph 2"]:
-            current_view = self.get_current_view("Graph 1")
-            new_range = (
-                max(current_view[0] + (current_view[1] - current_view[0]) * 0.25, self.get_signal_bounds("Graph 1")[0]),
-                min(current_view[1] - (current_view[1] - current_view[0]) * 0.25, self.get_signal_bounds("Graph 2")[1])
-            )
-            self.set_view_range("Graph 1", new_range)
-            self.set_view_range("Graph 2", new_range)
-  
+        self.zoom(0.25)
 
     def zoom_out(self):
-       selected_graph = self.plotComboBox.currentText()
-       if selected_graph in self.signal_data and self.signal_data[selected_graph] is not None:
+        self.zoom(-0.25)
+
+    def zoom(self, fraction):
+        """Shrink (fraction > 0) or grow the x view of the selected graph; linked graphs follow it."""
+        selected_graph = self.plotComboBox.currentText()
+        if selected_graph not in self.plot_widgets:
+            return
+        if not any(self.signal_store.channels(graph_name) for graph_name in self.linked_graphs(selected_graph)):
+            return
         current_view = self.get_current_view(selected_graph)
-        new_range = (
-            max(current_view[0] - (current_view[1] - current_view[0]) * 0.25, self.get_signal_bounds(selected_graph)[0]),
-            min(current_view[1] + (current_view[1] - current_view[0]) * 0.25, self.get_signal_bounds(selected_graph)[1])
-        )
-        self.set_view_range(selected_graph, new_range) 
-
-         ############### Linking working #############
-       if self.linked==True &((selected_graph=="Graph 1")or(selected_graph=="Graph 2")):
-         if self.is_playing_graph["Graph 1"] and self.is_playing_graph["Graph 2"]:
-            current_view = self.get_current_view("Graph 1")
-            new_range = (
-                max(current_view[0] - (current_view[1] - current_view[0]) * 0.25, self.get_signal_bounds("Graph 1")[0]),
-                min(current_view[1] + (current_view[1] - current_view[0]) * 0.25, self.get_signal_bounds("Graph 1")[1])
-            )
-            self.set_view_range("Graph 1", new_range) 
-            self.set_view_range("Graph 2", new_range)
+        width = current_view[1] - current_view[0]
+        self.set_view_range(selected_graph, (current_view[0] + width * fraction, current_view[1] - width * fraction))
 
     def recenter_view(self, graph_name):
-     """Recenter the view to focus on the latest data point."""
-     if graph_name in self.plotted_data and self.plotted_data[graph_name][0]:
-        # Focus on the latest point added
-        last_time = self.plotted_data[graph_name][0][-1]
-        view_range = self.get_current_view(graph_name)
-        
-        # Adjust the view range to keep it centered around the last time point
-        new_range = (
-            max(last_time - (view_range[1] - view_range[0]) / 2, self.get_signal_bounds(graph_name)[0]),
-            min(last_time + (view_range[1] - view_range[0]) / 2, self.get_signal_bounds(graph_name)[1])
-        )
-        self.set_view_range(graph_name, new_range)
+        """Recenter the view to focus on the latest data point."""
+        buffers = [signal.buffer for signal in self.signal_store.channels(graph_name) if signal.buffer.size]
+        if buffers:
+            # Focus on the latest point added
+            last_time = max(buffer.last_time() for buffer in buffers)
+            view_range = self.get_current_view(graph_name)
+
+            # Adjust the view range to keep it centered around the last time point
+            new_range = (last_time - (view_range[1] - view_range[0]) / 2, last_time + (view_range[1] - view_range[0]) / 2)
+            self.set_view_range(graph_name, new_range)
 
     def get_signal_bounds(self, graph_name):
-     if graph_name in self.signal_data and self.signal_data[graph_name] is not None:
-        time, _ = self.signal_data[graph_name]
-        return time[0], time[-1]  # Return the min and max time
-     return 0, 1  # Default bounds if no data   
+        """First and last time over the channels of the graph and of the graphs linked to it."""
+        times = [signal.time for linked_graph in self.linked_graphs(graph_name)
+                 for signal in self.signal_store.channels(linked_graph) if len(signal)]
+        # A .sig file converted with a blank row ends in a NaN time
+        times = [time for time in times if np.isfinite(time[0]) and np.isfinite(time[-1])]
+        if times:
+            return min(time[0] for time in times), max(time[-1] for time in times)  # Return the min and max time
+        return 0, 1  # Default bounds if no data
 
     def get_current_view(self, graph_name):
-        if graph_name == "Graph 1":
-            return self.graph1.viewRange()[0]
-        elif graph_name == "Graph 2":
-            return self.graph2.viewRange()[0]
-        elif graph_name == "Glued Signals":
-            return self.gluedGraph.viewRange()[0]
-        elif graph_name == "Graph 3":
-            return self.graph3.viewRange()[0]
+        return self.plot_widgets[graph_name].viewRange()[0]
 
     def set_view_range(self, graph_name, new_range):
-     min_bound, max_bound = self.get_signal_bounds(graph_name)
-     new_range = (max(new_range[0], min_bound), min(new_range[1], max_bound))
-    
-     if graph_name == "Graph 1":
-        self.graph1.setXRange(*new_range)
-     elif graph_name == "Graph 2":
-        self.graph2.setXRange(*new_range)
-     elif graph_name == "Glued Signals":
-        self.gluedGraph.setXRange(*new_range)
-     elif graph_name == "Graph 3":
-        self.graph3.setXRange(*new_range)
+        min_bound, max_bound = self.get_signal_bounds(graph_name)
+        new_range = (max(new_range[0], min_bound), min(new_range[1], max_bound))
+        if new_range[1] > new_range[0] and graph_name in self.plot_widgets:
+            self.plot_widgets[graph_name].setXRange(*new_range)  # Linked graphs follow in on_view_range_changed
+
+    def push_group_view(self, group, source):
+        """Give every other member of the group the x view of source, in one batched update."""
+        x_range = self.plot_widgets[source].plotItem.vb.viewRange()[0]
+        members = [self.plot_widgets[graph_name] for graph_name in group.members if graph_name != source]
+        self.syncing_views = True  # Members don't push the range on again
+        try:
+            # Repaints are held until every member has its new range
+            for plot_widget in members:
+                plot_widget.setUpdatesEnabled(False)
+            for plot_widget in members:
+                plot_widget.setXRange(*x_range, padding=0)
+        finally:
+            for plot_widget in members:
+                plot_widget.setUpdatesEnabled(True)
+            self.syncing_views = False
 
     def openColorDialog(self):
-       """Open a color dialog to change the color of the selected graph."""
-       selected_graph = self.plotComboBox.currentText()
-       color = QColorDialog.getColor()
-
-       if color.isValid():
-        # Update the color for the selected graph
-        self.graph_colors[selected_graph] = color.name()  # Store the color name
-        self.plot_signal(selected_graph)  # Re-plot the graph with the new color
-         ############# linking working #############
-       if self.linked==True &((selected_graph=="Graph 1")or(selected_graph=="Graph 2")):
-         if self.is_playing_graph["Graph 1"] and self.is_playing_graph["Graph 2"]:
-            self.graph_colors["Graph 1"] = color.name() 
-            self.graph_colors["Graph 2"] = color.name() 
-            self.plot_signal("Graph 1")
-            self.plot_signal("Graph 2")
-     
-    def linkGraphs(self):
-        if self.linked:
-            # Unlink graph1 and graph2
-            self.graph1.setXLink(None)
-            self.graph2.setXLink(None)
-            self.linked = False
+        """Open a color dialog to change the color of the selected graph and the graphs linked to it."""
+        selected_graph = self.plotComboBox.currentText()
+        if selected_graph not in self.graph_colors:
+            return
+        color = QColorDialog.getColor()
+
+        if color.isValid():
+            for graph_name in self.linked_graphs(selected_graph):
+                self.set_graph_color(graph_name, color.name())  # Store the color name
+                self.plot_signal(graph_name)  # Re-plot the graph with the new color
+
+    def set_graph_color(self, graph_name, color):
+        self.graph_colors[graph_name] = color
+        for signal in self.signal_store.channels(graph_name):
+            signal.color = color
+
+    def show_graph_controls(self, graph_name):
+        """Show the filter preset and display mode of the newly selected graph (Graph 3 has neither)."""
+        self.filterInput.setEnabled(graph_name in self.graph_filters)
+        self.filterInput.blockSignals(True)
+        self.filterInput.setCurrentText(self.graph_filters.get(graph_name, 'No filter'))
+        self.filterInput.blockSignals(False)
+        self.spectrogramBtn.setEnabled(graph_name in self.plot_widgets)
+        self.spectrogramBtn.blockSignals(True)
+        self.spectrogramBtn.setChecked(graph_name in self.spectrograms)
+        self.spectrogramBtn.blockSignals(False)
+
+    def set_spectrogram(self, graph_name, enabled):
+        """Switch a graph between its curves and the spectrogram of its first channel."""
+        plot_widget = self.plot_widgets.get(graph_name)
+        channels = self.signal_store.channels(graph_name)
+        spectrogram = self.spectrograms.pop(graph_name, None)
+        if spectrogram is not None:
+            spectrogram.reset()
+        if enabled and plot_widget is not None and channels:
+            signal = channels[0]
+            spectrogram = Spectrogram(plot_widget, signal)
+            self.spectrograms[graph_name] = spectrogram
+            # Start from the recent history, at most what the tiles can show
+            played = len(signal) if signal.tracker is not None else signal.last_index
+            values = signal.amplitude if signal.filtered is None else signal.filtered
+            first = finite_start(values, max(played - SPECTROGRAM_TILE * SPECTROGRAM_TILES * SPECTROGRAM_HOP, 0), played)
+            spectrogram.extend(signal.time[first:played], values[first:played])
+        if plot_widget is not None:
+            self.live_y_ranges.pop(graph_name, None)
+            plot_widget.enableAutoRange()
+            self.plot_signal(graph_name)
+        if graph_name == self.plotComboBox.currentText():
+            self.show_graph_controls(graph_name)  # Unchecks the button when there was nothing to show
+
+    def feed_analysis(self, signal, times, values):
+        """Pass newly played or received samples to the spectrogram and heart rate following the channel."""
+        spectrogram = self.spectrograms.get(signal.graph)
+        if spectrogram is not None and spectrogram.signal is signal:
+            spectrogram.extend(times, values)
+        if signal is self.heart_rate_signal:
+            self.feed_heart_rate(times, values)
+
+    def set_heart_rate(self, enabled):
+        """Follow the first channel of the selected graph with an R-peak detector feeding Graph 3."""
+        self.heart_rate_signal = self.heart_rate_detector = self.heart_rate_store = None
+        selected_graph = self.plotComboBox.currentText()
+        channels = self.signal_store.channels(selected_graph)
+        if not enabled or selected_graph not in self.plot_widgets or not channels:
+            if enabled:
+                self.heartRateBtn.setChecked(False)  # Nothing to follow
+            return
+        signal = channels[0]
+        self.restart_heart_rate(signal)
+        # What was already played is searched once, then the beats come as samples do
+        played = len(signal) if signal.tracker is not None else signal.last_index
+        values = signal.amplitude if signal.filtered is None else signal.filtered
+        first = finite_start(values, 0, played)  # A NaN would stay in the detector's filter for good
+        if played > first:
+            self.feed_heart_rate(signal.time[first:played], values[first:played])
+
+    def restart_heart_rate(self, signal):
+        self.heart_rate_signal = signal
+        self.heart_rate_detector = None  # Made with the first samples, once the sampling rate is known
+        self.heart_rate_store = GrowableSignal()
+        self.data = self.graph3.data = None
+        self.graph3.angle = 0
+        self.reset_radar_stats()
+
+    def feed_heart_rate(self, times, values):
+        signal = self.heart_rate_signal
+        if self.heart_rate_detector is None:
+            if signal.tracker is not None:
+                if len(signal) < 2:
+                    return
+                signal.sample_rate = estimate_sample_rate(signal.time[-1000:])
+            self.heart_rate_detector = RPeakDetector(signal.sample_rate)
+        beats, rates = self.heart_rate_detector.process(times, values)
+        if not len(rates):
+            return
+        store = self.heart_rate_store
+        first = store.size == 0
+        store.extend(beats, rates)
+        self.data = store.amplitude[:store.size]
+        self.graph3.data = self.data  # The radar redraws its trace when the data grows
+        if first:
+            self.start_cine_mode()
+
+    def set_graph_filter(self, graph_name, preset):
+        """Filter the channels of a graph with a preset from now on; only the end of what was played is filtered."""
+        if graph_name not in self.graph_filters or self.graph_filters[graph_name] == preset:
+            return
+        self.graph_filters[graph_name] = preset
+        for signal in self.signal_store.channels(graph_name):
+            signal.chain = None  # Live channels get their new chain with the next samples
+        self.attach_filters(graph_name)
+        self.plot_signal(graph_name)
+
+    def attach_filters(self, graph_name):
+        """Give the file channels of a graph that have no chain one for the graph's preset.
+
+        The channels of one recording advance together, so they share a chain and are filtered in one call.
+        """
+        stages = FILTER_PRESETS[self.graph_filters[graph_name]]
+        recordings = {}
+        for signal in self.signal_store.channels(graph_name):
+            if signal.tracker is None and signal.chain is None:
+                recordings.setdefault(signal.path, []).append(signal)
+        for signals in recordings.values():
+            sections = filter_sections(stages, signals[0].sample_rate)
+            chain = BiquadCascade(sections, len(signals)) if sections else None
+            for column, signal in enumerate(signals):
+                if chain is None and signal.filtered is None:
+                    continue  # Nothing to filter, nor to undo
+                signal.chain, signal.chain_column = chain, column
+                self.filter_history(signal)
+        self.filters_attached.add(graph_name)
+
+    def attach_live_filter(self, signal, times):
+        """Give a live channel its chain once its sampling rate can be told from the received timestamps."""
+        stages = FILTER_PRESETS[self.graph_filters.get(signal.graph, 'No filter')]
+        if not stages:
+            return
+        history = np.concatenate((signal.time[-1000:], times))
+        if len(history) < 2:
+            return
+        signal.sample_rate = estimate_sample_rate(history)
+        sections = filter_sections(stages, signal.sample_rate)
+        if sections:
+            signal.chain, signal.chain_column = BiquadCascade(sections), 0
+
+    def ensure_filtered(self, signal, valid):
+        """Keep the filtered copy of a file channel as long as its (possibly still loading) samples."""
+        size = len(signal.pyramid.amplitude) if signal.pyramid is not None else len(signal)
+        if signal.filtered is None or len(signal.filtered) < size:
+            filtered = np.empty(max(size, 2 * len(signal.filtered) if signal.filtered is not None else 0), CHANNEL_DTYPE)
+            if signal.filtered is not None:
+                filtered[:valid] = signal.filtered[:valid]
+            signal.filtered = filtered
+            signal.filtered_pyramid = None
+        # The loader swaps the time array when it grows the channel; the summary must follow it
+        if signal.pyramid is not None and (signal.filtered_pyramid is None
+                                           or signal.filtered_pyramid.time is not signal.pyramid.time):
+            signal.filtered_pyramid = MinMaxPyramid(signal.pyramid.time, signal.filtered, valid_samples=valid)
+
+    def filter_history(self, signal):
+        """Bring a file channel's (new) chain up to the play position, or go back to the raw samples without one.
+
+        Like a seek, only the last SEEK_FILTER_SAMPLES played samples are filtered, so a preset change costs
+        the same on any length of history; the filtered copy before them is left as a gap (NaN).
+        """
+        played = signal.last_index
+        warm = 0
+        if signal.chain is None:
+            signal.filtered = signal.filtered_pyramid = None
+            values = signal.amplitude
         else:
-            # Link graph1 and graph2
-            self.graph1.setXLink(self.graph2)
-            x_range = self.graph1.viewRange()[0]
-            self.graph2.setXRange(x_range[0], x_range[1])
-            self.linked = True  
-               
+            signal.chain.reset([signal.chain_column])
+            self.ensure_filtered(signal, 0)
+            warm = max(played - SEEK_FILTER_SAMPLES, 0)
+            signal.filtered[:warm] = np.nan
+            for start in range(warm, played, FILTER_CHUNK):
+                stop = min(start + FILTER_CHUNK, played)
+                signal.filtered[start:stop] = signal.chain.process(signal.amplitude[start:stop], [signal.chain_column])
+            if signal.filtered_pyramid is not None:
+                signal.filtered_pyramid.truncate(0)  # Summaries of the previous preset's output
+                signal.filtered_pyramid.skip(warm)
+                signal.filtered_pyramid.update(played)
+            values = signal.filtered
+        signal.stats = RunningStats()
+        signal.stats.extend(values[warm:played])
+        signal.buffer.reset()
+        tail = max(played - signal.buffer.capacity, 0)
+        signal.buffer.extend(signal.time[tail:played], values[tail:played])
+
+    def play_samples(self, played):
+        """Pass newly played (signal, start, stop) ranges through their filters into the buffers and statistics."""
+        batches = {}
+        for signal, start, stop in played:
+            if signal.chain is None:
+                self.show_samples(signal, start, stop, signal.amplitude[start:stop])
+            else:
+                batches.setdefault((id(signal.chain), start, stop), []).append(signal)
+        for (_, start, stop), signals in batches.items():
+            # One call for all the channels of a recording that moved by the same samples
+            block = np.column_stack([signal.amplitude[start:stop] for signal in signals])
+            filtered = signals[0].chain.process(block, [signal.chain_column for signal in signals])
+            for column, signal in enumerate(signals):
+                self.ensure_filtered(signal, start)
+                signal.filtered[start:stop] = filtered[:, column]
+                if signal.filtered_pyramid is not None:
+                    signal.filtered_pyramid.update(stop)
+                self.show_samples(signal, start, stop, filtered[:, column])
+
+    def show_samples(self, signal, start, stop, values):
+        signal.buffer.extend(signal.time[start:stop], values)
+        signal.stats.extend(values)
+        signal.last_index = stop
+        self.feed_analysis(signal, signal.time[start:stop], values)
+
+    def graph_duration(self, graph_name):
+        """Seconds spanned by the longest file channel of a graph or of its link group."""
+        durations = [signal.time[-1] - signal.time[0] for member in self.linked_graphs(graph_name)
+                     for signal in self.signal_store.channels(member) if signal.tracker is None and len(signal)]
+        # A .sig file converted with a blank row ends in a NaN time
+        return max((duration for duration in durations if np.isfinite(duration)), default=0.0)
+
+    def update_scrubbers(self):
+        """Move the scrubbers along with playback, without seeking."""
+        for graph_name, scrubber in self.scrubbers.items():
+            if scrubber.isSliderDown():
+                continue  # Being dragged
+            duration = self.graph_duration(graph_name)
+            value = int(round(SCRUB_STEPS * self.graph_position(graph_name) / duration)) if duration > 0 else 0
+            if value != scrubber.value():
+                scrubber.blockSignals(True)
+                scrubber.setValue(value)
+                scrubber.blockSignals(False)
+
+    def scrub(self, graph_name, value):
+        duration = self.graph_duration(graph_name)
+        if duration > 0:
+            self.seek(graph_name, duration * value / SCRUB_STEPS)
+
+    def seek(self, graph_name, position):
+        """Jump a graph and the graphs linked to it to position seconds from their start.
+
+        Each channel finds its sample by binary search on its time column and the window before it is drawn
+        straight from the level-of-detail pyramid; nothing before the new position is played again.
+        """
+        group = self.link_groups.get(graph_name)
+        if group is not None:
+            group.position = position
+        for member in self.linked_graphs(graph_name):
+            channels = [signal for signal in self.signal_store.channels(member) if signal.tracker is None and len(signal)]
+            for signal in channels:
+                self.seek_signal(signal, int(np.searchsorted(signal.time, signal.time[0] + position, side='right')))
+            if member in self.spectrograms:
+                self.set_spectrogram(member, True)  # Restarted from the window before the new position
+            view_box = self.plot_widgets[member].plotItem.vb
+            if channels and not view_box.autoRangeEnabled()[0]:
+                # Same zoom, ending at the new position
+                x_min, x_max = view_box.viewRange()[0]
+                end = channels[0].time[0] + position
+                self.plot_widgets[member].setXRange(end - (x_max - x_min), end, padding=0)
+            self.plot_signal(member)
+        self.update_scrubbers()
+
+    def seek_signal(self, signal, index):
+        """Put a file channel's playback position at index."""
+        previous = signal.last_index
+        signal.last_index, signal.cursor = index, float(index)
+        values = signal.amplitude
+        if signal.chain is not None:
+            # The chain only needs the samples just before the new position to continue from there
+            self.ensure_filtered(signal, previous)
+            warm = max(index - SEEK_FILTER_SAMPLES, 0)
+            signal.chain.reset([signal.chain_column])
+            filtered = signal.chain.process(signal.amplitude[warm:index], [signal.chain_column])
+            if index > previous:
+                signal.filtered[previous:warm] = np.nan  # Skipped, drawn as a gap
+                start = max(warm, previous)
+                signal.filtered[start:index] = filtered[start - warm:]
+            if signal.filtered_pyramid is not None:
+                signal.filtered_pyramid.truncate(min(previous, index))
+                signal.filtered_pyramid.skip(warm)
+                signal.filtered_pyramid.update(index)
+            values = signal.filtered
+        if signal is self.heart_rate_signal:
+            self.restart_heart_rate(signal)  # Beats from the new position on
+        signal.stats = RunningStats()  # Counted from the new position
+        signal.buffer.reset()
+        tail = max(index - signal.buffer.capacity, 0)
+        signal.buffer.extend(signal.time[tail:index], values[tail:index])
+
+    def graph_position(self, graph_name):
+        """Seconds played by the furthest file channel of a graph."""
+        positions = [signal.time[signal.last_index - 1] - signal.time[0]
+                     for signal in self.signal_store.channels(graph_name) if signal.tracker is None and signal.last_index]
+        return max(positions, default=0.0)
+
+    def linkGraphs(self):
+        """Choose the graphs linked to the selected one."""
+        selected_graph = self.plotComboBox.currentText()
+        dialog = LinkDialog(list(self.plot_widgets), self.linked_graphs(selected_graph))
+        if dialog.exec_() == QDialog.Accepted:
+            self.set_link_group(dialog.get_linked_graphs(), selected_graph)
+
+    def set_link_group(self, members, leader=None):
+        """Link members into one group (taking them out of their old groups); fewer than two just unlinks.
+
+        The leader, the graph the dialog was opened on, leaves its group even when it isn't among the members.
+        """
+        unlinked = list(members) + ([leader] if leader is not None and leader not in members else [])
+        for graph_name in unlinked:
+            old_group = self.link_groups.pop(graph_name, None)
+            if old_group is not None:
+                old_group.members.remove(graph_name)
+                if len(old_group.members) < 2:
+                    for remaining in old_group.members:
+                        self.link_groups.pop(remaining, None)
+        if len(members) < 2:
+            return None
+
+        # Start from the furthest played member, so nothing already drawn is taken back
+        group = LinkGroup(members, max(self.graph_position(graph_name) for graph_name in members))
+        for graph_name in members:
+            self.link_groups[graph_name] = group
+        leader = leader if leader in members else members[0]
+        playing = self.is_playing_graph[leader]
+        for graph_name in members:
+            self.is_playing_graph[graph_name] = playing
+        self.push_group_view(group, leader)
+        return group
+
+    @profiled
     def update_circular_graph(self):
         if self.graph3.data is not None:
             self.graph3.update_circular_graph()  # Update graph for the current index
@@ -1128,114 +3697,60 @@ class MainWindow(QWidget):
 
     def start_cine_mode(self):
         if self.data is not None:
-            self.timer.start(100)  # Update every 100 ms
+            self.graph3.start_animation()  # The radar has its own animation timer
 
     def stop_cine_mode(self):
-        self.timer.stop()
+        self.graph3.stop_animation()
+
+    def capture_glued_graph(self):
+        """Rasterize the glued graph as it is now; encoding and writing happen in an ExportWorker."""
+        from pyqtgraph import exporters
+        exporter = exporters.ImageExporter(self.gluedGraph.plotItem)
+        return exporter.export(toBytes=True)
+
+    def start_export(self, image, **files):
+        worker = ExportWorker(image, parent=self, **files)
+        worker.saved.connect(self.show_export_notice)
+        worker.failed.connect(self.show_export_notice)
+        worker.finished.connect(lambda worker=worker: self.on_export_finished(worker))
+        self.export_workers.append(worker)
+        worker.start()
+
+    def on_export_finished(self, worker):
+        self.export_workers.remove(worker)
+        worker.deleteLater()
+
+    def show_export_notice(self, message):
+        # Shown in the window instead of a modal box so playback keeps going
+        self.exportLabel.setText(message)
+        self.exportNoticeTimer.start(EXPORT_NOTICE_MS)
 
     def take_snapshot(self):
-        # Specify the directory where the snapshots will be saved
-        snapshot_dir = "snapshots"
-        os.makedirs(snapshot_dir, exist_ok=True)  # Create the directory if it doesn't exist
-
         # Define the filename with date and time
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        snapshot_filename = os.path.join(snapshot_dir, f"snapshot_{timestamp}.png")
-
-        # Access the "Glued Signals" graph
-        glued_signals_plot = self.gluedGraph.plotItem  # Adjust this if necessary to get the correct graph
+        snapshot_filename = os.path.join("snapshots", f"snapshot_{timestamp}.png")
 
-        # Take the snapshot
-        exporter = pg.exporters.ImageExporter(glued_signals_plot)
-        exporter.export(snapshot_filename)
-
-        # Show success message
-        msg = QMessageBox()
-        msg.setIcon(QMessageBox.Information)
-        msg.setText("Snapshot saved successfully!")
-        msg.setInformativeText(f"Saved to: {snapshot_filename}")
-        msg.setWindowTitle("Snapshot Success")
-        msg.exec_()
+        self.start_export(self.capture_glued_graph(), snapshot_filename=snapshot_filename)
 
     def export_report(self):
+        # Statistics are kept up to date while the signals play, nothing is recomputed here
+        stats = self.panel_stats('Glued Signals')
+        if not stats.count:
+            self.show_export_notice("Export Report: the glued graph has no data yet.")
+            return
+
         # Create the PDF file name based on the current date and time
         now = datetime.now()
         report_filename = f"reports/report_{now.strftime('%Y-%m-%d_%H-%M-%S')}.pdf"
 
-        # Create a canvas object
-        c = canvas.Canvas(report_filename, pagesize=letter)
-        width, height = letter
-
-        # Add images and text
-        logo_height = 70  # height of the logo in the header
-        c.drawImage("images/uni-logo.png", width - 150, height - logo_height - 40, width=100, height=logo_height)  # right side
-        c.drawImage("images/sbme-logo.jpg", 50, height - logo_height - 40, width=100, height=logo_height)  # left side
-        
-        # Title in the middle
-        c.setFont("Helvetica-Bold", 22)
-        c.drawCentredString(width / 2, height - 90, "Biological Signal Report")
-
-        # Take snapshot of "Glued Signals" graph
-        snapshot_path = f"snapshots/snapshot_{now.strftime('%Y%m%d_%H%M%S')}.png"
-        exporter = pg.exporters.ImageExporter(self.gluedGraph.plotItem)  # Adjust this to your actual reference
-        exporter.export(snapshot_path)
-
-        # Add the snapshot to the PDF
-        snapshot_y_position = height - logo_height - 100  # Adjust this to place it below the title
-        c.drawImage(snapshot_path, 50, snapshot_y_position - 200, width=500, height=200)  # Adjust positioning and size
-
-        # Gather data from the gluedGraph (assuming it’s a PyQtGraph plot with data)
-        # Extract the data from the graph for statistics calculation
-        plot_data = self.gluedGraph.plotItem.listDataItems()[0].getData()  # Assuming the first data item
-        y_data = plot_data[1]  # Get the y-values for statistics
-
-        # Calculate statistics
-        mean = np.mean(y_data)
-        median = np.median(y_data)
-        std_dev = np.std(y_data)
-        min_val = np.min(y_data)
-        max_val = np.max(y_data)
-
-        # Create the table data
-        table_data = [
-            ['Statistic', 'Value'],
-            ['Mean', f'{mean:.5f}'],
-            ['Median', f'{median:.5f}'],
-            ['Std_dev', f'{std_dev:.5f}'],
-            ['Min', f'{min_val:.5f}'],
-            ['Max', f'{max_val:.5f}'],
-        ]
-
-        # Create the table
-        table = Table(table_data, colWidths=[200, 200])
-
-        # Add style to the table
-        style = TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.black),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ])
-        table.setStyle(style)
-
-        # Convert table into a canvas element
-        table.wrapOn(c, width, height)
-        table.drawOn(c, 103, snapshot_y_position - 370)  # Adjust positioning based on where you want the table
-
-
-        # Finalize the PDF
-        c.showPage()
-        c.save()
-
-        # Show success message
-        QMessageBox.information(self, "Export Report", f"Report saved as {report_filename}.")
+        # Only the capture and the table rows are made here, the PDF is written by the worker
+        self.start_export(self.capture_glued_graph(), report_filename=report_filename,
+                          table_data=stats_table([('Glued Signals', stats)]))
 
 
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
+    mark_startup('qapplication')
     window = MainWindow()
     sys.exit(app.exec_())
\ No newline at end of file
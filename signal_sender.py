@@ -0,0 +1,70 @@
+"""Stand-in acquisition device: streams samples to a viewer port over TCP or UDP.
+
+Usage: python signal_sender.py tcp://127.0.0.1:9001 [--rate 5000] [--format text|f32|f64] [--file dataset/normal_ecg.csv]
+Start the viewer first, type the same address in the source field, select a graph and press Connect.
+Without --file a 10 Hz sine with noise is sent; a CSV file (time, amplitude) is looped.
+"""
+import argparse
+import socket
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+
+
+def load_samples(file_name, rate):
+    if file_name:
+        return pd.read_csv(file_name, header=None)[1].to_numpy(dtype=np.float64)
+    t = np.arange(int(rate)) / rate
+    return np.sin(2 * np.pi * 10 * t) + 0.1 * np.random.randn(len(t))
+
+
+def encode(times, values, fmt):
+    if fmt == 'text':
+        return ''.join(f"{t:.6f},{v:.6g}\n" for t, v in zip(times, values)).encode()
+    # The time stays float64 in both binary formats: float32 can't tell epoch seconds apart
+    records = np.empty(len(values), dtype=[('time', '<f8'), ('value', '<f4' if fmt == 'f32' else '<f8')])
+    records['time'], records['value'] = times, values
+    return records.tobytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send a test signal to the viewer over TCP or UDP.")
+    parser.add_argument('url', help="tcp://host:port or udp://host:port")
+    parser.add_argument('--rate', type=float, default=1000, help="samples per second")
+    parser.add_argument('--format', choices=['text', 'f32', 'f64'], default='text')
+    parser.add_argument('--packet-ms', type=float, default=10, help="time covered by one packet")
+    parser.add_argument('--file', help="CSV file to loop instead of the synthetic sine")
+    parser.add_argument('--duration', type=float, default=0, help="seconds to send (0 = until interrupted)")
+    args = parser.parse_args()
+
+    parts = urlsplit(args.url)
+    kind = socket.SOCK_STREAM if parts.scheme == 'tcp' else socket.SOCK_DGRAM
+    address = (parts.hostname or '127.0.0.1', parts.port)
+    samples = load_samples(args.file, args.rate)
+    per_packet = max(1, int(args.rate * args.packet_ms / 1000))
+
+    with socket.socket(socket.AF_INET, kind) as sock:
+        if kind == socket.SOCK_STREAM:
+            sock.connect(address)
+        start = time.time()
+        sent = 0
+        while not args.duration or time.time() - start < args.duration:
+            # Wait until the next packet is due
+            due = start + sent / args.rate
+            delay = due - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            index = np.arange(sent, sent + per_packet)
+            payload = encode(start + index / args.rate, samples[index % len(samples)], args.format)
+            if kind == socket.SOCK_STREAM:
+                sock.sendall(payload)
+            else:
+                sock.sendto(payload, address)
+            sent += per_packet
+        print(f"Sent {sent} samples in {time.time() - start:.1f} s")
+
+
+if __name__ == '__main__':
+    main()